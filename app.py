@@ -5,12 +5,19 @@ Clean separation between business logic and UI presentation
 """
 
 import gradio as gr
+import logging
+import re
 import time
 from datetime import datetime
 from typing import List, Dict
 
+# Application-wide log output (library modules only create loggers); configured
+# before the project imports so their import-time data-loading logs are shown
+logging.basicConfig(level=logging.INFO)
+
 # Import core email management system (business logic only) - Excel integration
 from email_manager import (
+    EmailData,
     create_email_management_system,
     extract_customer_email_from_content,
     refresh_email_state,
@@ -18,7 +25,7 @@ from email_manager import (
 )
 
 # Import streaming utilities
-from streaming_utils import StreamingEventCollector, format_streaming_event
+from streaming_utils import StreamingEventCollector, format_streaming_event, NO_RESPONSE_MESSAGE
 
 # Import batch analysis functionality
 from batch_analyzer import create_batch_processor
@@ -27,6 +34,16 @@ from batch_analyzer import create_batch_processor
 # UI Constants
 SUBJECT_TRUNCATE_LENGTH = 60
 
+# Precompiled patterns for email previews and AI response sections
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+INTENT_SECTION_PATTERN = re.compile(r'##\s*Intent Classification(.*?)(?=##|$)', re.DOTALL | re.IGNORECASE)
+LOGISTICS_SECTION_PATTERN = re.compile(r'##\s*Logistics/Order Status(.*?)(?=##|$)', re.DOTALL | re.IGNORECASE)
+
+# Display rows for the last formatted emails list; the email cache hands back
+# the same list object until the workbook changes, so rows can be reused
+_DISPLAY_ROWS_CACHE = {'emails': None, 'rows': []}
+
 # Model options for the dropdown
 MODEL_OPTIONS = [
 #    ("Claude 3.5 Sonnet", "claude-3-5-sonnet"),
@@ -57,22 +74,21 @@ email_state, email_functions = create_email_management_system(
 
 
 # UI Formatting Functions (moved from email_manager.py)
-def format_email_for_display(email: Dict) -> List[str]:
+def format_email_for_display(email: EmailData) -> List[str]:
     """
     Format single email for display in UI
     
     Args:
-        email: Email data dictionary to format
+        email: Email record to format
         
     Returns:
         List[str]: Formatted email row for display
     """
     # Extract content preview for subject column
-    content = email.get('content', '')
+    content = email.content
     # Remove HTML tags and get first meaningful text
-    import re
-    clean_content = re.sub(r'<[^>]+>', '', content)  # Remove HTML tags
-    clean_content = re.sub(r'\s+', ' ', clean_content).strip()  # Normalize whitespace
+    clean_content = HTML_TAG_PATTERN.sub('', content)  # Remove HTML tags
+    clean_content = WHITESPACE_PATTERN.sub(' ', clean_content).strip()  # Normalize whitespace
     
     # Get first meaningful part of content for subject display
     content_preview = (
@@ -83,34 +99,39 @@ def format_email_for_display(email: Dict) -> List[str]:
     
     # If content is empty or very short, use original subject as fallback
     if not content_preview or len(content_preview.strip()) < 10:
-        content_preview = email.get('subject', 'No content available')
+        content_preview = email.subject
     
     return [
-        email.get('email_id', 'Unknown'),  # Email-ID instead of sender
-        email.get('send_time', 'Unknown'),  # Converse-time instead of recipient
+        email.email_id,  # Email-ID instead of sender
+        email.send_time,  # Converse-time instead of recipient
         content_preview  # Content preview instead of subject (removed status column)
     ]
 
 
-def format_emails_for_display(emails: List[Dict]) -> List[List[str]]:
+def format_emails_for_display(emails: List[EmailData]) -> List[List[str]]:
     """
     Format list of emails for display in UI
     
+    Rows are reused while the same (immutable) emails list is passed in.
+    
     Args:
-        emails: List of email data dictionaries
+        emails: List of email records
         
     Returns:
         List[List[str]]: Formatted email rows for display
     """
-    return [format_email_for_display(email) for email in emails]
+    if _DISPLAY_ROWS_CACHE['emails'] is not emails:
+        _DISPLAY_ROWS_CACHE['rows'] = [format_email_for_display(email) for email in emails]
+        _DISPLAY_ROWS_CACHE['emails'] = emails
+    return _DISPLAY_ROWS_CACHE['rows']
 
 
-def format_email_details(email: Dict) -> str:
+def format_email_details(email: EmailData) -> str:
     """
     Format email details for detailed view
     
     Args:
-        email: Email data dictionary to format
+        email: Email record to format
         
     Returns:
         str: Formatted email details string
@@ -120,17 +141,17 @@ def format_email_details(email: Dict) -> str:
 
 **Content:**
 ```
-{email['content']}
+{email.content}
 ```
 """
 
 
-def format_ai_response(email: Dict, ai_response: str) -> str:
+def format_ai_response(email: EmailData, ai_response: str) -> str:
     """
     Format AI response for display
     
     Args:
-        email: Original email data dictionary
+        email: Original email record
         ai_response: AI generated response
         
     Returns:
@@ -139,8 +160,8 @@ def format_ai_response(email: Dict, ai_response: str) -> str:
     return f"""
 ## 🤖 AI Agent Response
 
-**Email:** {email['subject']}  
-**From:** {email['sender']}  
+**Email:** {email.subject}  
+**From:** {email.sender}  
 **Processing Time:** {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}  
 
 **AI Generated Response:**
@@ -161,13 +182,13 @@ def refresh_emails():
     global email_state, email_functions
     
     # Refresh state immutably - creates new state object
-    email_state = email_functions['refresh_state']()
+    email_state = email_functions.refresh_state()
     
     # Update functions with new state
     email_functions = create_email_processor(email_state)
     
     # Return new display data using UI formatting function
-    return format_emails_for_display(email_functions['get_emails']())
+    return format_emails_for_display(email_functions.get_emails())
 
 
 def update_reasoning_config(enable_thinking: bool, thinking_budget: int, max_tokens: int):
@@ -263,7 +284,7 @@ def view_email_details(evt: gr.SelectData):
     selected_row = evt.index[0]
     
     # Use functional approach to get email by index
-    email = email_functions['get_email_by_index'](selected_row)
+    email = email_functions.get_email_by_index(selected_row)
     
     if not email:
         return "❌ Email not found."
@@ -307,13 +328,10 @@ def extract_intent_classification(ai_response: str) -> str:
         """
     
     # Look for intent classification and logistics sections
-    import re
-    
     formatted_content = ""
     
     # Try to find the Intent Classification section
-    intent_pattern = r'##\s*Intent Classification(.*?)(?=##|$)'
-    intent_match = re.search(intent_pattern, ai_response, re.DOTALL | re.IGNORECASE)
+    intent_match = INTENT_SECTION_PATTERN.search(ai_response)
     
     if intent_match:
         intent_content = intent_match.group(1).strip()
@@ -324,8 +342,7 @@ def extract_intent_classification(ai_response: str) -> str:
 """
     
     # Try to find the Logistics/Order Status section
-    logistics_pattern = r'##\s*Logistics/Order Status(.*?)(?=##|$)'
-    logistics_match = re.search(logistics_pattern, ai_response, re.DOTALL | re.IGNORECASE)
+    logistics_match = LOGISTICS_SECTION_PATTERN.search(ai_response)
     
     if logistics_match:
         logistics_content = logistics_match.group(1).strip()
@@ -412,14 +429,14 @@ def handle_ai_copilot_streaming(selected_idx: int):
         return
     
     # Get email using functional approach
-    email = email_functions['get_email_by_index'](selected_idx)
+    email = email_functions.get_email_by_index(selected_idx)
     if not email:
         error_msg = "❌ Email not found."
         yield error_msg, error_msg, extract_intent_classification("")
         return
     
     # Extract customer email using core business function
-    customer_email = extract_customer_email_from_content(email['content'])
+    customer_email = extract_customer_email_from_content(email.content)
     
     # Initialize event collector
     collector = StreamingEventCollector()
@@ -438,7 +455,7 @@ def handle_ai_copilot_streaming(selected_idx: int):
         pending_updates = False
         
         # Process with AI using streaming
-        for event in email_functions['process_with_ai_streaming'](email['content'], customer_email):
+        for event in email_functions.process_with_ai_streaming(email.content, customer_email):
             # Add event to collector
             collector.add_event(event)
             
@@ -461,7 +478,7 @@ def handle_ai_copilot_streaming(selected_idx: int):
                 
                 # Now get the final response (after MESSAGE event is added)
                 final_response = collector.get_final_response()
-                if final_response and final_response != "No response generated. Please check the thinking process for details.":
+                if final_response and final_response != NO_RESPONSE_MESSAGE:
                     response_display = format_ai_response(email, final_response)
                     # Extract intent classification from the final response
                     intent_display = extract_intent_classification(final_response)
@@ -499,12 +516,12 @@ def handle_ai_copilot_streaming(selected_idx: int):
         
         # Final response formatting
         final_response = collector.get_final_response()
-        if final_response == "No response generated. Please check the thinking process for details.":
+        if final_response == NO_RESPONSE_MESSAGE:
             response_display = f"""
 ## 🤖 AI Agent Loop Response
 
-**Email:** {email['subject']}  
-**From:** {email['sender']}  
+**Email:** {email.subject}  
+**From:** {email.sender}  
 **Processing Time:** {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}  
 
 **Status:** ⚠️ Processing completed but no final response was generated.
@@ -559,7 +576,7 @@ def get_initial_email_display():
     Returns:
         List[List[str]]: Formatted email data for initial display
     """
-    return format_emails_for_display(email_functions['get_emails']())
+    return format_emails_for_display(email_functions.get_emails())
 
 
 def create_interface():
@@ -828,7 +845,7 @@ def get_system_info():
         Dict: Information about the current email management system
     """
     return {
-        'email_count': email_functions['get_email_count'](),
+        'email_count': email_functions.get_email_count(),
         'excel_file': email_state['excel_file'],
         'ai_agent_available': email_state['agent'] is not None,
         'architecture': 'Functional Programming',
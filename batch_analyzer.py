@@ -4,6 +4,7 @@ Extends existing Smart Analysis to process multiple emails and write results to
 Uses functional programming style consistent with existing codebase
 """
 
+import os
 import time
 import re
 import csv
@@ -13,28 +14,37 @@ from typing import List, Dict, Tuple
 from collections import Counter
 from pathlib import Path
 
+from email_manager import EmailProcessor
 from streaming_utils import StreamingEventCollector
 
 
+# Precompiled patterns for AI response parsing
+INTENT_SECTION_PATTERN = re.compile(r'##\s*Intent Classification(.*?)(?=##|$)', re.DOTALL | re.IGNORECASE)
+LOGISTICS_SECTION_PATTERN = re.compile(r'##\s*Logistics/Order Status(.*?)(?=##|$)', re.DOTALL | re.IGNORECASE)
+# Values are captured in a lookahead so only the label is consumed and a Confidence
+# later on the same line (e.g. "Primary Intent: X (Confidence: High)") still matches
+INTENT_FIELD_PATTERN = re.compile(r'(Primary Intent|Confidence):(?=[^\S\n]*([^\n]+))', re.IGNORECASE)
+ORDER_ID_PATTERN = re.compile(r'Order ID:\s*([^\n]+)', re.IGNORECASE)
+
+
 def extract_intent_from_response(ai_response: str) -> Tuple[str, str]:
     """Extract primary intent and confidence from AI response"""
     primary_intent = "Unknown"
     confidence_level = "Unknown"
     
     try:
-        intent_pattern = r'##\s*Intent Classification(.*?)(?=##|$)'
-        intent_match = re.search(intent_pattern, ai_response, re.DOTALL | re.IGNORECASE)
+        intent_match = INTENT_SECTION_PATTERN.search(ai_response)
         
         if intent_match:
             intent_content = intent_match.group(1).strip()
             
-            primary_match = re.search(r'Primary Intent:\s*([^\n]+)', intent_content, re.IGNORECASE)
-            if primary_match:
-                primary_intent = primary_match.group(1).strip()
+            # Collect both fields in one scan, keeping the first occurrence of each
+            fields = {}
+            for field_match in INTENT_FIELD_PATTERN.finditer(intent_content):
+                fields.setdefault(field_match.group(1).lower(), field_match.group(2).strip())
             
-            confidence_match = re.search(r'Confidence:\s*([^\n]+)', intent_content, re.IGNORECASE)
-            if confidence_match:
-                confidence_level = confidence_match.group(1).strip()
+            primary_intent = fields.get('primary intent', primary_intent)
+            confidence_level = fields.get('confidence', confidence_level)
     
     except Exception:
         pass
@@ -45,12 +55,11 @@ def extract_intent_from_response(ai_response: str) -> Tuple[str, str]:
 def extract_order_id_from_response(ai_response: str) -> str:
     """Extract order ID from AI response"""
     try:
-        logistics_pattern = r'##\s*Logistics/Order Status(.*?)(?=##|$)'
-        logistics_match = re.search(logistics_pattern, ai_response, re.DOTALL | re.IGNORECASE)
+        logistics_match = LOGISTICS_SECTION_PATTERN.search(ai_response)
         
         if logistics_match:
             logistics_content = logistics_match.group(1).strip()
-            order_match = re.search(r'Order ID:\s*([^\n]+)', logistics_content, re.IGNORECASE)
+            order_match = ORDER_ID_PATTERN.search(logistics_content)
             if order_match:
                 return order_match.group(1).strip()
     except Exception:
@@ -128,8 +137,16 @@ def update_csv_with_intents(csv_path: str, intent_results: Dict[str, str], backu
             else:
                 print(f"⚠️  Email-id {email_id} not found in CSV")
         
-        # Write updated data back to CSV
-        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+        # Write updated data to a temp file and swap it in, so a failed write never truncates the CSV
+        tmp_path = f"{csv_path}.tmp"
+        try:
+            df.to_csv(tmp_path, index=False, encoding='utf-8-sig')
+            os.replace(tmp_path, csv_path)
+        except Exception:
+            # Don't leave a partial temp file behind
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
         print(f"💾 CSV updated successfully with {updates_made} changes")
         
         return True
@@ -139,12 +156,12 @@ def update_csv_with_intents(csv_path: str, intent_results: Dict[str, str], backu
         return False
 
 
-def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str = "./intent/lcsc-emails-intent.csv", max_emails: int = None) -> Dict:
+def process_batch_emails_with_csv_update(email_functions: EmailProcessor, csv_path: str = "./intent/lcsc-emails-intent.csv", max_emails: int = None) -> Dict:
     """
     Process emails in batch and update CSV with intent classifications
     
     Args:
-        email_functions: Email processing functions from email_manager
+        email_functions: Email processor from email_manager
         csv_path: Path to the CSV file to update
         max_emails: Maximum number of emails to process (None for all)
         
@@ -156,7 +173,7 @@ def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str =
         print(f"❌ CSV file not found: {csv_path}")
         return {"error": "CSV file not found"}
     
-    emails = email_functions['get_emails']()
+    emails = email_functions.get_emails()
     total_emails = len(emails)
     
     # Limit emails if specified
@@ -173,10 +190,10 @@ def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str =
     start_time = time.time()
     
     for i, email in enumerate(emails):
-        email_id = email.get('email_id', '')
+        email_id = email.email_id
         print(f"📧 Processing email {i+1}/{total_emails}")
         print(f"   Email ID: {email_id}")
-        print(f"   Sender: {email.get('sender', 'Unknown')}")
+        print(f"   Sender: {email.sender}")
         
         email_start_time = time.time()
         
@@ -185,7 +202,7 @@ def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str =
             collector = StreamingEventCollector()
             
             # Process with existing streaming function
-            for event in email_functions['process_with_ai_streaming'](email['content'], email.get('sender', '')):
+            for event in email_functions.process_with_ai_streaming(email.content, email.sender):
                 collector.add_event(event)
                 
                 if "error" in event:
@@ -206,7 +223,7 @@ def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str =
                 
                 result = {
                     'email_id': email_id,
-                    'sender': email.get('sender', ''),
+                    'sender': email.sender,
                     'status': 'completed',
                     'processing_time': processing_time,
                     'primary_intent': primary_intent,
@@ -225,7 +242,7 @@ def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str =
             else:
                 result = {
                     'email_id': email_id,
-                    'sender': email.get('sender', ''),
+                    'sender': email.sender,
                     'status': 'failed',
                     'processing_time': processing_time,
                     'error': 'No AI response generated'
@@ -236,7 +253,7 @@ def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str =
             processing_time = time.time() - email_start_time
             result = {
                 'email_id': email_id,
-                'sender': email.get('sender', ''),
+                'sender': email.sender,
                 'status': 'failed',
                 'processing_time': processing_time,
                 'error': str(e)
@@ -276,13 +293,13 @@ def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str =
     Process emails in batch using existing Smart Analysis functionality
     
     Args:
-        email_functions: Email processing functions from email_manager
+        email_functions: Email processor from email_manager
         max_emails: Maximum number of emails to process (None for all)
         
     Returns:
         Dict: Batch processing results and statistics
     """
-    emails = email_functions['get_emails']()
+    emails = email_functions.get_emails()
     total_emails = len(emails)
     
     # Limit emails if specified
@@ -298,8 +315,8 @@ def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str =
     
     for i, email in enumerate(emails):
         print(f"📧 Processing email {i+1}/{total_emails}")
-        print(f"   Email ID: {email.get('email_id', 'Unknown')}")
-        print(f"   Sender: {email.get('sender', 'Unknown')}")
+        print(f"   Email ID: {email.email_id}")
+        print(f"   Sender: {email.sender}")
         
         email_start_time = time.time()
         
@@ -308,7 +325,7 @@ def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str =
             collector = StreamingEventCollector()
             
             # Process with existing streaming function
-            for event in email_functions['process_with_ai_streaming'](email['content'], email.get('sender', '')):
+            for event in email_functions.process_with_ai_streaming(email.content, email.sender):
                 collector.add_event(event)
                 
                 if "error" in event:
@@ -324,8 +341,8 @@ def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str =
                 order_id = extract_order_id_from_response(ai_response)
                 
                 result = {
-                    'email_id': email.get('email_id', ''),
-                    'sender': email.get('sender', ''),
+                    'email_id': email.email_id,
+                    'sender': email.sender,
                     'status': 'completed',
                     'processing_time': processing_time,
                     'primary_intent': primary_intent,
@@ -343,8 +360,8 @@ def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str =
                 
             else:
                 result = {
-                    'email_id': email.get('email_id', ''),
-                    'sender': email.get('sender', ''),
+                    'email_id': email.email_id,
+                    'sender': email.sender,
                     'status': 'failed',
                     'processing_time': processing_time,
                     'error': 'No AI response generated'
@@ -354,8 +371,8 @@ def process_batch_emails_with_csv_update(email_functions: Dict, csv_path: str =
         except Exception as e:
             processing_time = time.time() - email_start_time
             result = {
-                'email_id': email.get('email_id', ''),
-                'sender': email.get('sender', ''),
+                'email_id': email.email_id,
+                'sender': email.sender,
                 'status': 'failed',
                 'processing_time': processing_time,
                 'error': str(e)
@@ -469,12 +486,12 @@ def print_batch_summary_report(stats: Dict):
     print("="*80)
 
 
-def create_batch_processor_with_csv(email_functions: Dict, csv_path: str = "./intent/lcsc-emails-intent.csv"):
+def create_batch_processor_with_csv(email_functions: EmailProcessor, csv_path: str = "./intent/lcsc-emails-intent.csv"):
     """
     Create batch processing function with CSV update capability
     
     Args:
-        email_functions: Email processing functions from email_manager
+        email_functions: Email processor from email_manager
         csv_path: Path to the CSV file to update
         
     Returns:
@@ -487,7 +504,7 @@ def create_batch_processor_with_csv(email_functions: Dict, csv_path: str = "./in
 
 
 # Legacy function for backward compatibility
-def process_batch_emails(email_functions: Dict, max_emails: int = None) -> Dict:
+def process_batch_emails(email_functions: EmailProcessor, max_emails: int = None) -> Dict:
     """
     Original batch processing function (now with CSV update)
     Enhanced to include CSV writing functionality
@@ -495,7 +512,7 @@ def process_batch_emails(email_functions: Dict, max_emails: int = None) -> Dict:
     return process_batch_emails_with_csv_update(email_functions, "./intent/lcsc-emails-intent.csv", max_emails)
 
 
-def create_batch_processor(email_functions: Dict):
+def create_batch_processor(email_functions: EmailProcessor):
     """
     Original batch processor creator (now with CSV update)
     Enhanced to include CSV writing functionality
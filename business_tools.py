@@ -6,12 +6,30 @@ Defines LCSC business tools used by the Agent
 from strands import tool
 from typing import Dict, List, Optional
 import csv
+import logging
 import os
+import re
+import sys
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
 # Data directory path
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
 
+# Columns drawn from small fixed vocabularies; interned at load time so
+# repeated values share one string object and compare by identity
+INTERNED_CUSTOMER_FIELDS = ('country', 'vip_level')
+INTERNED_ORDER_FIELDS = ('status', 'currency', 'shipping_status')
+INTERNED_PRODUCT_FIELDS = ('category', 'currency', 'stock_status')
+INTERNED_BATCH_CODE_FIELDS = ('quality_grade',)
+
+def intern_fields(row: Dict, fields: tuple) -> Dict:
+    """Intern the given string columns of a CSV row in place"""
+    for field in fields:
+        row[field] = sys.intern(row[field])
+    return row
+
 def load_customers_from_csv() -> Dict:
     """Load customers data from CSV file"""
     customers = {}
@@ -21,12 +39,12 @@ def load_customers_from_csv() -> Dict:
         with open(csv_path, 'r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
             for row in reader:
-                customers[row['email']] = row
-        print(f"✅ Loaded {len(customers)} customers from CSV")
+                customers[row['email']] = intern_fields(row, INTERNED_CUSTOMER_FIELDS)
+        logger.info("Loaded %s customers from CSV", len(customers))
     except FileNotFoundError:
-        print(f"❌ Customers CSV file not found: {csv_path}")
+        logger.error("Customers CSV file not found: %s", csv_path)
     except Exception as e:
-        print(f"❌ Error loading customers CSV: {e}")
+        logger.error("Error loading customers CSV: %s", e)
     
     return customers
 
@@ -41,12 +59,12 @@ def load_orders_from_csv() -> Dict:
             for row in reader:
                 # Convert numeric fields
                 row['total_amount'] = float(row['total_amount'])
-                orders[row['order_id']] = row
-        print(f"✅ Loaded {len(orders)} orders from CSV")
+                orders[row['order_id']] = intern_fields(row, INTERNED_ORDER_FIELDS)
+        logger.info("Loaded %s orders from CSV", len(orders))
     except FileNotFoundError:
-        print(f"❌ Orders CSV file not found: {csv_path}")
+        logger.error("Orders CSV file not found: %s", csv_path)
     except Exception as e:
-        print(f"❌ Error loading orders CSV: {e}")
+        logger.error("Error loading orders CSV: %s", e)
     
     return orders
 
@@ -72,11 +90,11 @@ def load_order_products_from_csv() -> Dict:
                     'quantity': row['quantity'],
                     'unit_price': row['unit_price']
                 })
-        print(f"✅ Loaded order products for {len(order_products)} orders from CSV")
+        logger.info("Loaded order products for %s orders from CSV", len(order_products))
     except FileNotFoundError:
-        print(f"❌ Order products CSV file not found: {csv_path}")
+        logger.error("Order products CSV file not found: %s", csv_path)
     except Exception as e:
-        print(f"❌ Error loading order products CSV: {e}")
+        logger.error("Error loading order products CSV: %s", e)
     
     return order_products
 
@@ -93,12 +111,12 @@ def load_products_from_csv() -> Dict:
                 row['unit_price'] = float(row['unit_price'])
                 row['stock_quantity'] = int(row['stock_quantity'])
                 row['min_order_qty'] = int(row['min_order_qty'])
-                products[row['product_id']] = row
-        print(f"✅ Loaded {len(products)} products from CSV")
+                products[row['product_id']] = intern_fields(row, INTERNED_PRODUCT_FIELDS)
+        logger.info("Loaded %s products from CSV", len(products))
     except FileNotFoundError:
-        print(f"❌ Products CSV file not found: {csv_path}")
+        logger.error("Products CSV file not found: %s", csv_path)
     except Exception as e:
-        print(f"❌ Error loading products CSV: {e}")
+        logger.error("Error loading products CSV: %s", e)
     
     return products
 
@@ -111,12 +129,12 @@ def load_batch_codes_from_csv() -> Dict:
         with open(csv_path, 'r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
             for row in reader:
-                batch_codes[row['product_id']] = row
-        print(f"✅ Loaded {len(batch_codes)} batch codes from CSV")
+                batch_codes[row['product_id']] = intern_fields(row, INTERNED_BATCH_CODE_FIELDS)
+        logger.info("Loaded %s batch codes from CSV", len(batch_codes))
     except FileNotFoundError:
-        print(f"❌ Batch codes CSV file not found: {csv_path}")
+        logger.error("Batch codes CSV file not found: %s", csv_path)
     except Exception as e:
-        print(f"❌ Error loading batch codes CSV: {e}")
+        logger.error("Error loading batch codes CSV: %s", e)
     
     return batch_codes
 
@@ -132,12 +150,13 @@ def load_document_templates_from_csv() -> Dict:
                 # Convert numeric fields
                 row['processing_time_hours'] = int(row['processing_time_hours'])
                 row['processing_fee_usd'] = float(row['processing_fee_usd'])
+                row['required_fields'] = tuple(row['required_fields'].split(';'))
                 templates[row['document_type']] = row
-        print(f"✅ Loaded {len(templates)} document templates from CSV")
+        logger.info("Loaded %s document templates from CSV", len(templates))
     except FileNotFoundError:
-        print(f"❌ Document templates CSV file not found: {csv_path}")
+        logger.error("Document templates CSV file not found: %s", csv_path)
     except Exception as e:
-        print(f"❌ Error loading document templates CSV: {e}")
+        logger.error("Error loading document templates CSV: %s", e)
     
     return templates
 
@@ -153,15 +172,23 @@ def load_general_inquiries_from_csv() -> Dict:
                 # Convert numeric fields
                 row['response_time_hours'] = int(row['response_time_hours'])
                 row['escalation_required'] = row['escalation_required'].lower() == 'yes'
+                row['keywords'] = tuple(keyword.strip().lower() for keyword in row['keywords'].split(','))
                 inquiries[row['inquiry_type']] = row
-        print(f"✅ Loaded {len(inquiries)} general inquiry templates from CSV")
+        logger.info("Loaded %s general inquiry templates from CSV", len(inquiries))
     except FileNotFoundError:
-        print(f"❌ General inquiries CSV file not found: {csv_path}")
+        logger.error("General inquiries CSV file not found: %s", csv_path)
     except Exception as e:
-        print(f"❌ Error loading general inquiries CSV: {e}")
+        logger.error("Error loading general inquiries CSV: %s", e)
     
     return inquiries
 
+def build_inquiry_keyword_patterns(inquiries: Dict) -> Dict:
+    """Compile one keyword alternation per inquiry type so content is scanned in a single regex pass"""
+    patterns = {}
+    for inquiry_type, template in inquiries.items():
+        patterns[inquiry_type] = re.compile('|'.join(map(re.escape, template['keywords'])))
+    return patterns
+
 # Load data from CSV files
 CUSTOMERS = load_customers_from_csv()
 ORDERS = load_orders_from_csv()
@@ -170,10 +197,19 @@ PRODUCTS = load_products_from_csv()
 BATCH_CODES = load_batch_codes_from_csv()
 DOCUMENT_TEMPLATES = load_document_templates_from_csv()
 GENERAL_INQUIRIES = load_general_inquiries_from_csv()
+GENERAL_INQUIRY_PATTERNS = build_inquiry_keyword_patterns(GENERAL_INQUIRIES)
 
 # In-memory storage for runtime modifications (like order interceptions)
 RUNTIME_ORDER_UPDATES = {}
 
+def _ok(data, message: str) -> Dict:
+    """Build a successful tool response envelope"""
+    return {"success": True, "data": data, "message": message}
+
+def _fail(message: str, data=None) -> Dict:
+    """Build a failed tool response envelope"""
+    return {"success": False, "data": data, "message": message}
+
 @tool
 def query_order_by_id(order_id: str) -> Dict:
     """
@@ -185,7 +221,7 @@ def query_order_by_id(order_id: str) -> Dict:
     Returns:
         Dict: Detailed order information including status, products, amount, etc.
     """
-    print(f"🔍 Querying order: {order_id}")
+    logger.debug("Querying order: %s", order_id)
     
     if order_id in ORDERS:
         order = ORDERS[order_id].copy()
@@ -200,19 +236,11 @@ def query_order_by_id(order_id: str) -> Dict:
         if order_id in RUNTIME_ORDER_UPDATES:
             order.update(RUNTIME_ORDER_UPDATES[order_id])
         
-        print(f"✅ Order found: {order_id}, Status: {order['status']}")
-        return {
-            "success": True,
-            "data": order,
-            "message": f"Successfully retrieved order {order_id}"
-        }
+        logger.info("Order found: %s, Status: %s", order_id, order['status'])
+        return _ok(order, f"Successfully retrieved order {order_id}")
     else:
-        print(f"❌ Order not found: {order_id}")
-        return {
-            "success": False,
-            "data": None,
-            "message": f"Order {order_id} does not exist"
-        }
+        logger.info("Order not found: %s", order_id)
+        return _fail(f"Order {order_id} does not exist")
 
 @tool
 def query_customer_by_email(email: str) -> Dict:
@@ -225,23 +253,15 @@ def query_customer_by_email(email: str) -> Dict:
     Returns:
         Dict: Detailed customer information
     """
-    print(f"🔍 Querying customer: {email}")
+    logger.debug("Querying customer: %s", email)
     
     if email in CUSTOMERS:
         customer = CUSTOMERS[email].copy()
-        print(f"✅ Customer found: {customer['name']} ({customer['customer_id']})")
-        return {
-            "success": True,
-            "data": customer,
-            "message": f"Successfully retrieved customer {email}"
-        }
+        logger.info("Customer found: %s (%s)", customer['name'], customer['customer_id'])
+        return _ok(customer, f"Successfully retrieved customer {email}")
     else:
-        print(f"❌ Customer not found: {email}")
-        return {
-            "success": False,
-            "data": None,
-            "message": f"Customer {email} does not exist"
-        }
+        logger.info("Customer not found: %s", email)
+        return _fail(f"Customer {email} does not exist")
 
 @tool
 def query_orders_by_customer(customer_email: str) -> Dict:
@@ -254,7 +274,7 @@ def query_orders_by_customer(customer_email: str) -> Dict:
     Returns:
         Dict: List of customer orders
     """
-    print(f"🔍 Querying customer orders: {customer_email}")
+    logger.debug("Querying customer orders: %s", customer_email)
     
     customer_orders = []
     for order_id, order in ORDERS.items():
@@ -273,19 +293,11 @@ def query_orders_by_customer(customer_email: str) -> Dict:
             customer_orders.append(order_copy)
     
     if customer_orders:
-        print(f"✅ Found {len(customer_orders)} orders")
-        return {
-            "success": True,
-            "data": customer_orders,
-            "message": f"Customer {customer_email} has {len(customer_orders)} orders"
-        }
+        logger.info("Found %s orders", len(customer_orders))
+        return _ok(customer_orders, f"Customer {customer_email} has {len(customer_orders)} orders")
     else:
-        print(f"❌ No orders found")
-        return {
-            "success": False,
-            "data": [],
-            "message": f"Customer {customer_email} has no orders"
-        }
+        logger.info("No orders found")
+        return _fail(f"Customer {customer_email} has no orders", [])
 
 @tool
 def query_product_by_id(product_id: str) -> Dict:
@@ -298,23 +310,15 @@ def query_product_by_id(product_id: str) -> Dict:
     Returns:
         Dict: Detailed product information
     """
-    print(f"🔍 Querying product: {product_id}")
+    logger.debug("Querying product: %s", product_id)
     
     if product_id in PRODUCTS:
         product = PRODUCTS[product_id].copy()
-        print(f"✅ Product found: {product['name']}")
-        return {
-            "success": True,
-            "data": product,
-            "message": f"Successfully retrieved product {product_id}"
-        }
+        logger.info("Product found: %s", product['name'])
+        return _ok(product, f"Successfully retrieved product {product_id}")
     else:
-        print(f"❌ Product not found: {product_id}")
-        return {
-            "success": False,
-            "data": None,
-            "message": f"Product {product_id} does not exist"
-        }
+        logger.info("Product not found: %s", product_id)
+        return _fail(f"Product {product_id} does not exist")
 
 @tool
 def query_inventory_status(product_id: str) -> Dict:
@@ -327,7 +331,7 @@ def query_inventory_status(product_id: str) -> Dict:
     Returns:
         Dict: Inventory status information (in stock/on order)
     """
-    print(f"🔍 Querying inventory: {product_id}")
+    logger.debug("Querying inventory: %s", product_id)
     
     if product_id in PRODUCTS:
         product = PRODUCTS[product_id]
@@ -341,19 +345,11 @@ def query_inventory_status(product_id: str) -> Dict:
             "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
-        print(f"✅ Stock status: {product['stock_status']}, Quantity: {product['stock_quantity']}")
-        return {
-            "success": True,
-            "data": inventory_info,
-            "message": f"Product {product_id} stock status: {product['stock_status']}"
-        }
+        logger.info("Stock status: %s, Quantity: %s", product['stock_status'], product['stock_quantity'])
+        return _ok(inventory_info, f"Product {product_id} stock status: {product['stock_status']}")
     else:
-        print(f"❌ Product not found: {product_id}")
-        return {
-            "success": False,
-            "data": None,
-            "message": f"Product {product_id} does not exist"
-        }
+        logger.info("Product not found: %s", product_id)
+        return _fail(f"Product {product_id} does not exist")
 
 @tool
 def intercept_order_shipping(order_id: str, reason: str) -> Dict:
@@ -367,55 +363,37 @@ def intercept_order_shipping(order_id: str, reason: str) -> Dict:
     Returns:
         Dict: Interception operation result
     """
-    print(f"🛑 Intercepting order shipment: {order_id}, Reason: {reason}")
+    logger.debug("Intercepting order shipment: %s, Reason: %s", order_id, reason)
     
     if order_id in ORDERS:
         # Get current shipping status (check runtime updates first)
         current_status = RUNTIME_ORDER_UPDATES.get(order_id, {}).get('shipping_status', ORDERS[order_id]['shipping_status'])
         
         if current_status in ["Shipped", "In Transit", "Delivered"]:
-            print(f"❌ Order already shipped, cannot intercept")
-            return {
-                "success": False,
-                "data": None,
-                "message": f"Order {order_id} has already been shipped and cannot be intercepted"
-            }
+            logger.info("Order already shipped, cannot intercept")
+            return _fail(f"Order {order_id} has already been shipped and cannot be intercepted")
         elif current_status == "Intercepted":
-            print(f"⚠️  Order already intercepted")
-            return {
-                "success": True,
-                "data": {"status": "Intercepted", "reason": reason},
-                "message": f"Order {order_id} is already intercepted"
-            }
+            logger.info("Order already intercepted")
+            return _ok({"status": "Intercepted", "reason": reason}, f"Order {order_id} is already intercepted")
         else:
             # Execute interception - store in runtime updates
-            if order_id not in RUNTIME_ORDER_UPDATES:
-                RUNTIME_ORDER_UPDATES[order_id] = {}
-            
-            RUNTIME_ORDER_UPDATES[order_id].update({
+            intercept_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            RUNTIME_ORDER_UPDATES.setdefault(order_id, {}).update({
                 "shipping_status": "Intercepted",
                 "intercept_reason": reason,
-                "intercept_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                "intercept_time": intercept_time
             })
             
-            print(f"✅ Order interception successful")
-            return {
-                "success": True,
-                "data": {
-                    "order_id": order_id,
-                    "status": "Intercepted",
-                    "reason": reason,
-                    "intercept_time": RUNTIME_ORDER_UPDATES[order_id]["intercept_time"]
-                },
-                "message": f"Order {order_id} has been successfully intercepted"
-            }
+            logger.info("Order interception successful")
+            return _ok({
+                "order_id": order_id,
+                "status": "Intercepted",
+                "reason": reason,
+                "intercept_time": intercept_time
+            }, f"Order {order_id} has been successfully intercepted")
     else:
-        print(f"❌ Order not found: {order_id}")
-        return {
-            "success": False,
-            "data": None,
-            "message": f"Order {order_id} does not exist"
-        }
+        logger.info("Order not found: %s", order_id)
+        return _fail(f"Order {order_id} does not exist")
 
 @tool
 def query_logistics_status(order_id: str) -> Dict:
@@ -428,7 +406,7 @@ def query_logistics_status(order_id: str) -> Dict:
     Returns:
         Dict: Logistics status information
     """
-    print(f"🚚 Querying logistics status: {order_id}")
+    logger.debug("Querying logistics status: %s", order_id)
     
     if order_id in ORDERS:
         order = ORDERS[order_id].copy()
@@ -467,19 +445,11 @@ def query_logistics_status(order_id: str) -> Dict:
                 {"time": order.get("intercept_time", ""), "status": "Intercepted", "location": "Warehouse", "reason": order.get("intercept_reason", "")}
             ]
         
-        print(f"✅ Logistics status: {order['shipping_status']}")
-        return {
-            "success": True,
-            "data": logistics_info,
-            "message": f"Order {order_id} logistics status: {order['shipping_status']}"
-        }
+        logger.info("Logistics status: %s", order['shipping_status'])
+        return _ok(logistics_info, f"Order {order_id} logistics status: {order['shipping_status']}")
     else:
-        print(f"❌ Order not found: {order_id}")
-        return {
-            "success": False,
-            "data": None,
-            "message": f"Order {order_id} does not exist"
-        }
+        logger.info("Order not found: %s", order_id)
+        return _fail(f"Order {order_id} does not exist")
 
 @tool
 def query_batch_dc_code(product_id: str) -> Dict:
@@ -492,17 +462,13 @@ def query_batch_dc_code(product_id: str) -> Dict:
     Returns:
         Dict: Batch/DC code information including production date, quality grade, etc.
     """
-    print(f"🔍 Querying batch/DC code for product: {product_id}")
+    logger.debug("Querying batch/DC code for product: %s", product_id)
     
     if product_id in BATCH_CODES:
         batch_info = BATCH_CODES[product_id].copy()
         
-        print(f"✅ Batch info found for {product_id}")
-        return {
-            "success": True,
-            "data": batch_info,
-            "message": f"Batch/DC code information retrieved for product {product_id}"
-        }
+        logger.info("Batch info found for %s", product_id)
+        return _ok(batch_info, f"Batch/DC code information retrieved for product {product_id}")
     elif product_id in PRODUCTS:
         # Fallback: generate batch info if not in batch_codes.csv but product exists
         product = PRODUCTS[product_id]
@@ -518,19 +484,11 @@ def query_batch_dc_code(product_id: str) -> Dict:
             "manufacturing_location": "Shenzhen, China"
         }
         
-        print(f"✅ Generated batch info for {product_id}")
-        return {
-            "success": True,
-            "data": batch_info,
-            "message": f"Batch/DC code information generated for product {product_id}"
-        }
+        logger.info("Generated batch info for %s", product_id)
+        return _ok(batch_info, f"Batch/DC code information generated for product {product_id}")
     else:
-        print(f"❌ Product not found: {product_id}")
-        return {
-            "success": False,
-            "data": None,
-            "message": f"Product {product_id} does not exist, cannot retrieve batch information"
-        }
+        logger.info("Product not found: %s", product_id)
+        return _fail(f"Product {product_id} does not exist, cannot retrieve batch information")
 
 @tool
 def process_document_request(request_type: str, order_id: str = None) -> Dict:
@@ -544,7 +502,7 @@ def process_document_request(request_type: str, order_id: str = None) -> Dict:
     Returns:
         Dict: Document processing result and next steps
     """
-    print(f"📄 Processing document request: {request_type}, Order: {order_id or 'General'}")
+    logger.debug("Processing document request: %s, Order: %s", request_type, order_id or 'General')
     
     # Check if we have template information for this document type
     template_info = None
@@ -556,19 +514,11 @@ def process_document_request(request_type: str, order_id: str = None) -> Dict:
     if not template_info:
         # Fallback for unknown document types
         valid_types = list(DOCUMENT_TEMPLATES.keys())
-        return {
-            "success": False,
-            "data": None,
-            "message": f"Invalid document type: {request_type}. Valid types: {', '.join(valid_types)}"
-        }
+        return _fail(f"Invalid document type: {request_type}. Valid types: {', '.join(valid_types)}")
     
     # Check if order exists (if order_id provided)
     if order_id and order_id not in ORDERS:
-        return {
-            "success": False,
-            "data": None,
-            "message": f"Order {order_id} does not exist"
-        }
+        return _fail(f"Order {order_id} does not exist")
     
     # Process document request using template information
     document_info = {
@@ -579,7 +529,7 @@ def process_document_request(request_type: str, order_id: str = None) -> Dict:
         "document_format": template_info['format'],
         "delivery_method": "Email",
         "processing_fee": f"${template_info['processing_fee_usd']} USD" if template_info['processing_fee_usd'] > 0 else "Free",
-        "required_fields": template_info['required_fields'].split(';'),
+        "required_fields": template_info['required_fields'],
         "processing_time_hours": template_info['processing_time_hours']
     }
     
@@ -592,12 +542,8 @@ def process_document_request(request_type: str, order_id: str = None) -> Dict:
             "currency": order["currency"]
         })
     
-    print(f"✅ Document request processed: {request_type}")
-    return {
-        "success": True,
-        "data": document_info,
-        "message": f"Document request for {request_type} has been processed and will be ready within {template_info['processing_time_hours']} hours"
-    }
+    logger.info("Document request processed: %s", request_type)
+    return _ok(document_info, f"Document request for {request_type} has been processed and will be ready within {template_info['processing_time_hours']} hours")
 
 @tool
 def handle_shipped_invoice(order_id: str, invoice_type: str) -> Dict:
@@ -611,14 +557,10 @@ def handle_shipped_invoice(order_id: str, invoice_type: str) -> Dict:
     Returns:
         Dict: Shipped invoice processing result
     """
-    print(f"🚢 Processing shipped invoice: {order_id}, Type: {invoice_type}")
+    logger.debug("Processing shipped invoice: %s, Type: %s", order_id, invoice_type)
     
     if order_id not in ORDERS:
-        return {
-            "success": False,
-            "data": None,
-            "message": f"Order {order_id} does not exist"
-        }
+        return _fail(f"Order {order_id} does not exist")
     
     order = ORDERS[order_id].copy()
     
@@ -629,11 +571,7 @@ def handle_shipped_invoice(order_id: str, invoice_type: str) -> Dict:
     # Check if order has been shipped
     shipping_status = order.get("shipping_status", "")
     if shipping_status not in ["Shipped", "In Transit", "Delivered"]:
-        return {
-            "success": False,
-            "data": None,
-            "message": f"Order {order_id} has not been shipped yet. Current status: {shipping_status}"
-        }
+        return _fail(f"Order {order_id} has not been shipped yet. Current status: {shipping_status}")
     
     # Process shipped invoice
     invoice_info = {
@@ -650,12 +588,8 @@ def handle_shipped_invoice(order_id: str, invoice_type: str) -> Dict:
         "rush_processing_fee": "$50 USD (6-12 hours)"
     }
     
-    print(f"✅ Shipped invoice processing initiated for {order_id}")
-    return {
-        "success": True,
-        "data": invoice_info,
-        "message": f"Shipped invoice processing for order {order_id} has been initiated. Invoice will be available within 24-48 hours."
-    }
+    logger.info("Shipped invoice processing initiated for %s", order_id)
+    return _ok(invoice_info, f"Shipped invoice processing for order {order_id} has been initiated. Invoice will be available within 24-48 hours.")
 
 @tool
 def handle_general_inquiry(inquiry_type: str, content: str, customer_email: str) -> Dict:
@@ -670,7 +604,7 @@ def handle_general_inquiry(inquiry_type: str, content: str, customer_email: str)
     Returns:
         Dict: General inquiry processing result and guidance
     """
-    print(f"❓ Processing general inquiry: {inquiry_type} from {customer_email}")
+    logger.debug("Processing general inquiry: %s from %s", inquiry_type, customer_email)
     
     # Get inquiry template information
     inquiry_template = None
@@ -679,10 +613,9 @@ def handle_general_inquiry(inquiry_type: str, content: str, customer_email: str)
     else:
         # Try to find matching inquiry type by keywords
         content_lower = content.lower()
-        for template_type, template_data in GENERAL_INQUIRIES.items():
-            keywords = template_data['keywords'].split(',')
-            if any(keyword.strip().lower() in content_lower for keyword in keywords):
-                inquiry_template = template_data
+        for template_type, pattern in GENERAL_INQUIRY_PATTERNS.items():
+            if pattern.search(content_lower):
+                inquiry_template = GENERAL_INQUIRIES[template_type]
                 inquiry_type = template_type
                 break
     
@@ -762,12 +695,8 @@ def handle_general_inquiry(inquiry_type: str, content: str, customer_email: str)
             "follow_up": "Regular follow-up until resolution"
         })
     
-    print(f"✅ General inquiry processed: {inquiry_type}")
-    return {
-        "success": True,
-        "data": response_info,
-        "message": f"Your {inquiry_type} inquiry has been received and will be processed according to our service standards"
-    }
+    logger.info("General inquiry processed: %s", inquiry_type)
+    return _ok(response_info, f"Your {inquiry_type} inquiry has been received and will be processed according to our service standards")
 
 # Business tools list for Agent usage
 BUSINESS_TOOLS = [
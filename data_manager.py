@@ -6,49 +6,127 @@ Helper script to manage CSV data files for LCSC business tools
 
 import csv
 import os
-from datetime import datetime
+import time
+import pandas as pd
+from functools import lru_cache
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
 
+# Buffer size for CSV writes, so a bulk append reaches the OS in a few large writes
+CSV_BUFFER_SIZE = 1 << 20
+
+CUSTOMER_FIELDNAMES = ['customer_id', 'name', 'email', 'phone', 'company', 'country', 'registration_date', 'vip_level']
+PRODUCT_FIELDNAMES = ['product_id', 'name', 'category', 'unit_price', 'currency', 'stock_status', 'stock_quantity', 'min_order_qty', 'lead_time']
+
+# Unique-key index per (csv_path, unique_key), tagged with the file signature it was built from
+_KEY_INDEX = {}
+
+def _file_signature(csv_path):
+    """Return (mtime_ns, size) for the CSV file, or None if it does not exist"""
+    try:
+        stat = os.stat(csv_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _load_key_index(csv_path, unique_key):
+    """Return the set of unique keys in the CSV file, rescanning only if the file changed"""
+    signature = _file_signature(csv_path)
+    if signature is None or signature[1] == 0:
+        return set()
+    
+    cached = _KEY_INDEX.get((csv_path, unique_key))
+    if cached and cached[0] == signature:
+        return cached[1]
+    
+    # Parse only the key column with pandas' C parser
+    df = pd.read_csv(csv_path, usecols=[unique_key], dtype=str, keep_default_na=False, encoding='utf-8')
+    keys = set(df[unique_key])
+    _KEY_INDEX[(csv_path, unique_key)] = (signature, keys)
+    return keys
+
+def _append_rows(csv_path, fieldnames, rows, unique_key):
+    """Append rows to the CSV file, skipping any whose unique key already exists
+    
+    Rows are positional sequences in fieldnames order. Duplicates are checked
+    against the file and within the batch itself, and all new rows are
+    written in a single open/close cycle.
+    
+    Returns:
+        list: The rows that were written
+    """
+    keys = _load_key_index(csv_path, unique_key)
+    key_position = fieldnames.index(unique_key)
+    # Track this batch's keys separately so a failed write leaves the cached index untouched
+    added_keys = set()
+    new_rows = []
+    for row in rows:
+        key = row[key_position]
+        if key not in keys and key not in added_keys:
+            added_keys.add(key)
+            new_rows.append(row)
+    
+    if not new_rows:
+        return new_rows
+    
+    has_rows = os.path.exists(csv_path) and os.path.getsize(csv_path) > 0
+    
+    # Append only the new rows; the header is written when the file is new
+    with open(csv_path, 'a', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as file:
+        writer = csv.writer(file, lineterminator='\n')
+        if not has_rows:
+            writer.writerow(fieldnames)
+        writer.writerows(new_rows)
+    
+    # Keep the index in step with our own write so the next call skips the rescan
+    keys |= added_keys
+    _KEY_INDEX[(csv_path, unique_key)] = (_file_signature(csv_path), keys)
+    return new_rows
+
+@lru_cache(maxsize=1)
+def _format_date(year, month, day):
+    """Format a date as YYYY-MM-DD"""
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+def _today_str():
+    """Return today's local date as YYYY-MM-DD, formatted once per day"""
+    return _format_date(*time.localtime()[:3])
+
+def _build_customer_row(customer_id, name, email, phone, company, country, vip_level="Bronze"):
+    """Build a customers.csv row in CUSTOMER_FIELDNAMES order"""
+    return (
+        customer_id,
+        name,
+        email,
+        phone,
+        company,
+        country,
+        _today_str(),  # registration_date
+        vip_level
+    )
+
+def _build_product_row(product_id, name, category, unit_price, currency, stock_quantity, min_order_qty=1, lead_time="1-3 days"):
+    """Build a products.csv row in PRODUCT_FIELDNAMES order"""
+    return (
+        product_id,
+        name,
+        category,
+        unit_price,
+        currency,
+        'In Stock' if stock_quantity > 0 else 'Out of Stock',  # stock_status
+        stock_quantity,
+        min_order_qty,
+        lead_time
+    )
+
 def add_customer(customer_id, name, email, phone, company, country, vip_level="Bronze"):
     """Add a new customer to the CSV file"""
     csv_path = os.path.join(DATA_DIR, 'customers.csv')
+    new_customer = _build_customer_row(customer_id, name, email, phone, company, country, vip_level)
     
-    # Check if customer already exists
-    existing_customers = []
-    try:
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            existing_customers = list(reader)
-            
-        # Check for duplicate email
-        for customer in existing_customers:
-            if customer['email'] == email:
-                print(f"❌ Customer with email {email} already exists")
-                return False
-    except FileNotFoundError:
-        pass
-    
-    # Add new customer
-    new_customer = {
-        'customer_id': customer_id,
-        'name': name,
-        'email': email,
-        'phone': phone,
-        'company': company,
-        'country': country,
-        'registration_date': datetime.now().strftime('%Y-%m-%d'),
-        'vip_level': vip_level
-    }
-    
-    existing_customers.append(new_customer)
-    
-    # Write back to CSV
-    with open(csv_path, 'w', newline='', encoding='utf-8') as file:
-        fieldnames = ['customer_id', 'name', 'email', 'phone', 'company', 'country', 'registration_date', 'vip_level']
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(existing_customers)
+    if not _append_rows(csv_path, CUSTOMER_FIELDNAMES, [new_customer], 'email'):
+        print(f"❌ Customer with email {email} already exists")
+        return False
     
     print(f"✅ Added customer: {name} ({email})")
     return True
@@ -56,47 +134,49 @@ def add_customer(customer_id, name, email, phone, company, country, vip_level="B
 def add_product(product_id, name, category, unit_price, currency, stock_quantity, min_order_qty=1, lead_time="1-3 days"):
     """Add a new product to the CSV file"""
     csv_path = os.path.join(DATA_DIR, 'products.csv')
+    new_product = _build_product_row(product_id, name, category, unit_price, currency, stock_quantity, min_order_qty, lead_time)
     
-    # Check if product already exists
-    existing_products = []
-    try:
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            existing_products = list(reader)
-            
-        # Check for duplicate product_id
-        for product in existing_products:
-            if product['product_id'] == product_id:
-                print(f"❌ Product with ID {product_id} already exists")
-                return False
-    except FileNotFoundError:
-        pass
-    
-    # Add new product
-    new_product = {
-        'product_id': product_id,
-        'name': name,
-        'category': category,
-        'unit_price': unit_price,
-        'currency': currency,
-        'stock_status': 'In Stock' if stock_quantity > 0 else 'Out of Stock',
-        'stock_quantity': stock_quantity,
-        'min_order_qty': min_order_qty,
-        'lead_time': lead_time
-    }
-    
-    existing_products.append(new_product)
-    
-    # Write back to CSV
-    with open(csv_path, 'w', newline='', encoding='utf-8') as file:
-        fieldnames = ['product_id', 'name', 'category', 'unit_price', 'currency', 'stock_status', 'stock_quantity', 'min_order_qty', 'lead_time']
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(existing_products)
+    if not _append_rows(csv_path, PRODUCT_FIELDNAMES, [new_product], 'product_id'):
+        print(f"❌ Product with ID {product_id} already exists")
+        return False
     
     print(f"✅ Added product: {name} ({product_id})")
     return True
 
+def add_customers_bulk(customers):
+    """
+    Add many customers to the CSV file in one pass
+    
+    Args:
+        customers: Iterable of dicts with the same keys as add_customer's arguments
+        
+    Returns:
+        int: Number of customers added (duplicates are skipped)
+    """
+    csv_path = os.path.join(DATA_DIR, 'customers.csv')
+    rows = (_build_customer_row(**customer) for customer in customers)
+    added = _append_rows(csv_path, CUSTOMER_FIELDNAMES, rows, 'email')
+    
+    print(f"✅ Added {len(added)} customers")
+    return len(added)
+
+def add_products_bulk(products):
+    """
+    Add many products to the CSV file in one pass
+    
+    Args:
+        products: Iterable of dicts with the same keys as add_product's arguments
+        
+    Returns:
+        int: Number of products added (duplicates are skipped)
+    """
+    csv_path = os.path.join(DATA_DIR, 'products.csv')
+    rows = (_build_product_row(**product) for product in products)
+    added = _append_rows(csv_path, PRODUCT_FIELDNAMES, rows, 'product_id')
+    
+    print(f"✅ Added {len(added)} products")
+    return len(added)
+
 def list_data(data_type):
     """List all data of a specific type"""
     if data_type == 'customers':
@@ -116,17 +196,29 @@ def list_data(data_type):
         return
     
     try:
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for i, row in enumerate(reader, 1):
-                if data_type == 'customers':
-                    print(f"{i}. {row['name']} ({row['email']}) - {row['vip_level']}")
-                elif data_type == 'orders':
-                    print(f"{i}. {row['order_id']} - {row['status']} - ${row['total_amount']} {row['currency']}")
-                elif data_type == 'products':
-                    print(f"{i}. {row['product_id']} - {row['name']} - {row['stock_status']}")
+        # Read as strings so values print exactly as stored in the CSV
+        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False, encoding='utf-8')
+        if data_type == 'customers':
+            rows = zip(df['name'], df['email'], df['vip_level'])
+            lines = [f"{i}. {name} ({email}) - {vip_level}"
+                     for i, (name, email, vip_level) in enumerate(rows, 1)]
+        elif data_type == 'orders':
+            rows = zip(df['order_id'], df['status'], df['total_amount'], df['currency'])
+            lines = [f"{i}. {order_id} - {status} - ${total_amount} {currency}"
+                     for i, (order_id, status, total_amount, currency) in enumerate(rows, 1)]
+        else:
+            rows = zip(df['product_id'], df['name'], df['stock_status'])
+            lines = [f"{i}. {product_id} - {name} - {stock_status}"
+                     for i, (product_id, name, stock_status) in enumerate(rows, 1)]
+        
+        # Emit the listing in one write instead of one stdout write per row
+        if lines:
+            print("\n".join(lines))
     except FileNotFoundError:
         print(f"❌ CSV file not found: {csv_path}")
+    except pd.errors.EmptyDataError:
+        # A 0-byte CSV has no rows to list
+        pass
 
 if __name__ == "__main__":
     import sys
@@ -5,9 +5,11 @@ Integrates with EmailParser for Excel-based email data
 """
 
 import os
+import re
+import sys
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple, Generator
-from functools import partial
 from agent import create_agent, run_streaming_process
 from email_parser import EmailParser, EmailParserError
 
@@ -17,26 +19,52 @@ DEFAULT_EXCEL_FILE = "./emails/lcsc-emails.xlsx"
 DEFAULT_RECIPIENT = "LCSC Customer Service"
 DEFAULT_STATUS = "Pending"
 
+# Precompiled patterns
+EMAIL_ADDRESS_PATTERN = re.compile(r'([^\s\n]+@[^\s\n]+)')
+
+# Parsed emails per Excel file, tagged with the (mtime_ns, size) they were loaded from
+_EMAILS_CACHE: Dict[str, Tuple[Tuple[int, int], List['EmailData']]] = {}
+
+# Loaded EmailParser per Excel file, tagged the same way so the workbook is read once
+_PARSER_CACHE: Dict[str, Tuple[Tuple[int, int], EmailParser]] = {}
+
+
+# Email data types
+@dataclass(slots=True, frozen=True)
+class EmailData:
+    """Immutable email record"""
+    email_id: str
+    filename: str
+    subject: str
+    sender: str
+    recipient: str
+    send_time: str
+    status: str
+    content: str
+    cs_id: str
+    file_path: str
+
 
 # Email data creation functions
 def create_email_data(email_id: str, subject: str, sender: str, recipient: str, 
-                     send_time: str, status: str, content: str, cs_id: str = "") -> Dict:
-    """Create email data dictionary compatible with the original format"""
-    return {
-        'email_id': email_id,
-        'filename': f"email_{email_id}.xlsx",  # Virtual filename for compatibility
-        'subject': subject,
-        'sender': sender,
-        'recipient': recipient,
-        'send_time': send_time,
-        'status': status,
-        'content': content,
-        'cs_id': cs_id,
-        'file_path': DEFAULT_EXCEL_FILE  # All emails come from the same Excel file
-    }
+                     send_time: str, status: str, content: str, cs_id: str = "") -> EmailData:
+    """Create email data record compatible with the original format"""
+    # Positional construction skips keyword-argument matching for this fixed shape
+    return EmailData(
+        email_id,
+        f"email_{email_id}.xlsx",  # Virtual filename for compatibility
+        subject,
+        sender,
+        recipient,
+        send_time,
+        status,
+        content,
+        cs_id,
+        DEFAULT_EXCEL_FILE  # All emails come from the same Excel file
+    )
 
 
-def create_email_manager_state(excel_file: str, agent: Optional[object], emails_cache: List[Dict]) -> Dict:
+def create_email_manager_state(excel_file: str, agent: Optional[object], emails_cache: List[EmailData]) -> Dict:
     """Create email manager state dictionary"""
     return {
         'excel_file': excel_file,
@@ -45,8 +73,49 @@ def create_email_manager_state(excel_file: str, agent: Optional[object], emails_
     }
 
 
+def get_file_signature(file_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Get a cheap change signature for a file
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Optional[Tuple[int, int]]: (mtime_ns, size), or None if the file cannot be stat'ed
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_email_parser(excel_file: str) -> EmailParser:
+    """
+    Get an EmailParser for a file, reusing the loaded one while the file is unchanged
+    
+    Args:
+        excel_file: Path to Excel file
+        
+    Returns:
+        EmailParser: Parser with the workbook loaded
+        
+    Raises:
+        EmailParserError: If the file cannot be loaded
+    """
+    signature = get_file_signature(excel_file)
+    cached = _PARSER_CACHE.get(excel_file)
+    if signature is not None and cached and cached[0] == signature:
+        return cached[1]
+    
+    parser = EmailParser(excel_file)
+    if signature is not None:
+        _PARSER_CACHE[excel_file] = (signature, parser)
+    return parser
+
+
 # Excel-based email parsing functions
-def parse_excel_email_to_dict(excel_email: Dict) -> Dict:
+def parse_excel_email_to_dict(excel_email: Dict) -> EmailData:
     """
     Convert Excel email data to the expected format
     
@@ -54,7 +123,7 @@ def parse_excel_email_to_dict(excel_email: Dict) -> Dict:
         excel_email: Email data from EmailParser
         
     Returns:
-        Dict: Email data in expected format
+        EmailData: Email data in expected format
     """
     # Extract subject from email content if not provided separately
     content = excel_email.get('email-content', '')
@@ -62,14 +131,23 @@ def parse_excel_email_to_dict(excel_email: Dict) -> Dict:
     # Try to extract subject from content (if it starts with "Subject:")
     subject = "No Subject"
     if content.startswith("Subject:"):
-        lines = content.split('\n')
-        if lines:
-            subject = lines[0].replace("Subject:", "").strip()
+        # Slice around the first newline instead of splitting and rejoining every line
+        newline = content.find('\n')
+        if newline == -1:
+            subject = content[8:].strip()
+            content = ''
+        else:
+            subject = content[8:newline].strip()
             # Remove subject line from content
-            content = '\n'.join(lines[1:]).strip()
+            content = content[newline + 1:].strip()
     
-    # Format sender information
+    # Format sender information; addresses repeat across rows, so share one string each
     sender = excel_email.get('sender', 'Unknown')
+    if isinstance(sender, str):
+        sender = sys.intern(sender)
+    recipient = excel_email.get('receiver', DEFAULT_RECIPIENT)
+    if isinstance(recipient, str):
+        recipient = sys.intern(recipient)
     
     # Format timestamp
     converse_time = excel_email.get('converse-time', '')
@@ -77,13 +155,13 @@ def parse_excel_email_to_dict(excel_email: Dict) -> Dict:
         send_time = converse_time
     else:
         # Handle pandas Timestamp objects
-        send_time = str(converse_time) if converse_time else datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        send_time = str(converse_time) if converse_time else datetime.now().isoformat(sep=' ', timespec='seconds')
     
     return create_email_data(
         email_id=str(excel_email.get('email-id', '')),
         subject=subject,
         sender=sender,
-        recipient=excel_email.get('receiver', DEFAULT_RECIPIENT),
+        recipient=recipient,
         send_time=send_time,
         status=DEFAULT_STATUS,
         content=content,
@@ -91,29 +169,34 @@ def parse_excel_email_to_dict(excel_email: Dict) -> Dict:
     )
 
 
-def load_emails_from_excel(excel_file: str) -> List[Dict]:
+def load_emails_from_excel(excel_file: str) -> List[EmailData]:
     """
     Load and parse all first emails from Excel file
     
+    Results are cached per file and reused until the file's mtime or size
+    changes, so refreshing an unchanged workbook does not re-parse it.
+    
     Args:
         excel_file: Path to Excel file
         
     Returns:
-        List[Dict]: List of parsed email data dictionaries (first email per ID)
+        List[EmailData]: List of parsed email records (first email per ID)
     """
+    signature = get_file_signature(excel_file)
+    cached = _EMAILS_CACHE.get(excel_file)
+    if signature is not None and cached and cached[0] == signature:
+        return cached[1]
+    
     try:
-        parser = EmailParser(excel_file)
-        email_ids = parser.get_email_ids()
-        emails = []
-        
-        for email_id in email_ids:
-            first_email = parser.get_first_email_by_id(email_id)
-            if first_email:
-                email_data = parse_excel_email_to_dict(first_email)
-                emails.append(email_data)
-        
-        # Sort by send time (oldest first)
-        return sorted(emails, key=lambda x: x['send_time'], reverse=False)
+        parser = get_email_parser(excel_file)
+        # Sort by send time (oldest first), consuming the parsed records lazily
+        emails = sorted(
+            (parse_excel_email_to_dict(first_email) for first_email in parser.get_first_emails()),
+            key=lambda x: x.send_time
+        )
+        if signature is not None:
+            _EMAILS_CACHE[excel_file] = (signature, emails)
+        return emails
         
     except EmailParserError as e:
         print(f"Error loading emails from Excel: {e}")
@@ -227,28 +310,28 @@ def refresh_email_state(state: Dict) -> Dict:
 
 
 # Email access functions (unchanged from original)
-def get_email_by_index(emails: List[Dict], index: int) -> Optional[Dict]:
+def get_email_by_index(emails: List[EmailData], index: int) -> Optional[EmailData]:
     """
     Get email by index from list
     
     Args:
-        emails: List of email data dictionaries
+        emails: List of email records
         index: Index to retrieve
         
     Returns:
-        Optional[Dict]: Email data or None if index invalid
+        Optional[EmailData]: Email record or None if index invalid
     """
     if 0 <= index < len(emails):
         return emails[index]
     return None
 
 
-def get_email_count(emails: List[Dict]) -> int:
+def get_email_count(emails: List[EmailData]) -> int:
     """
     Get count of emails
     
     Args:
-        emails: List of email data dictionaries
+        emails: List of email records
         
     Returns:
         int: Number of emails
@@ -256,8 +339,31 @@ def get_email_count(emails: List[Dict]) -> int:
     return len(emails)
 
 
-# Higher-order functions for creating specialized processors
-def create_email_processor(state: Dict):
+# Bound processor for a specific state
+class EmailProcessor:
+    """Email processing functions bound to a specific state"""
+    __slots__ = ('state',)
+    
+    def __init__(self, state: Dict):
+        self.state = state
+    
+    def get_email_by_index(self, index: int) -> Optional[EmailData]:
+        return get_email_by_index(self.state['emails_cache'], index)
+    
+    def process_with_ai_streaming(self, email_content: str, customer_email: Optional[str] = None) -> Generator:
+        return process_email_with_ai_streaming(self.state['agent'], email_content, customer_email)
+    
+    def refresh_state(self) -> Dict:
+        return refresh_email_state(self.state)
+    
+    def get_email_count(self) -> int:
+        return get_email_count(self.state['emails_cache'])
+    
+    def get_emails(self) -> List[EmailData]:
+        return self.state['emails_cache']
+
+
+def create_email_processor(state: Dict) -> EmailProcessor:
     """
     Create email processing functions bound to specific state
     
@@ -265,15 +371,9 @@ def create_email_processor(state: Dict):
         state: Email manager state dictionary
         
     Returns:
-        Dict: Dictionary of bound functions
+        EmailProcessor: Processor exposing the bound functions as methods
     """
-    return {
-        'get_email_by_index': partial(get_email_by_index, state['emails_cache']),
-        'process_with_ai_streaming': partial(process_email_with_ai_streaming, state['agent']),
-        'refresh_state': lambda: refresh_email_state(state),
-        'get_email_count': lambda: get_email_count(state['emails_cache']),
-        'get_emails': lambda: state['emails_cache']
-    }
+    return EmailProcessor(state)
 
 
 # Utility functions for email content analysis
@@ -287,15 +387,17 @@ def extract_customer_email_from_content(content: str) -> Optional[str]:
     Returns:
         Optional[str]: Customer email or None
     """
-    import re
-    email_match = re.search(r'([^\s\n]+@[^\s\n]+)', content)
+    # Cheap substring check skips the regex engine for content without addresses
+    if '@' not in content:
+        return None
+    email_match = EMAIL_ADDRESS_PATTERN.search(content)
     return email_match.group(1) if email_match else None
 
 
 # Main factory function
 def create_email_management_system(excel_file: str = DEFAULT_EXCEL_FILE, 
                                  model_name: str = "claude-3-7-sonnet",
-                                 config: dict = None) -> Tuple[Dict, Dict]:
+                                 config: dict = None) -> Tuple[Dict, EmailProcessor]:
     """
     Factory function to create complete email management system with reasoning capabilities
     
@@ -305,7 +407,7 @@ def create_email_management_system(excel_file: str = DEFAULT_EXCEL_FILE,
         config: Optional configuration dictionary with agent and model settings
         
     Returns:
-        Tuple[Dict, Dict]: State dictionary and bound functions dictionary
+        Tuple[Dict, EmailProcessor]: State dictionary and bound email processor
     """
     state = create_initial_email_manager_state(excel_file, model_name, config)
     functions = create_email_processor(state)
@@ -318,7 +420,7 @@ def create_email_management_system(excel_file: str = DEFAULT_EXCEL_FILE,
 
 
 # Additional Excel-specific functions
-def get_email_conversation_by_id(excel_file: str, email_id: str) -> List[Dict]:
+def get_email_conversation_by_id(excel_file: str, email_id: str) -> List[EmailData]:
     """
     Get full conversation for a specific email ID
     
@@ -327,19 +429,17 @@ def get_email_conversation_by_id(excel_file: str, email_id: str) -> List[Dict]:
         email_id: Email ID to get conversation for
         
     Returns:
-        List[Dict]: List of all emails in the conversation
+        List[EmailData]: List of all emails in the conversation
     """
     try:
-        parser = EmailParser(excel_file)
-        excel_emails = parser.get_all_emails_by_id(email_id)
-        
-        conversation = []
-        for excel_email in excel_emails:
-            email_data = parse_excel_email_to_dict(excel_email)
-            conversation.append(email_data)
+        parser = get_email_parser(excel_file)
+        excel_emails = parser.iter_emails_by_id(email_id)
         
         # Sort by timestamp
-        return sorted(conversation, key=lambda x: x['send_time'])
+        return sorted(
+            (parse_excel_email_to_dict(excel_email) for excel_email in excel_emails),
+            key=lambda x: x.send_time
+        )
         
     except EmailParserError as e:
         print(f"Error getting conversation for email ID {email_id}: {e}")
@@ -357,7 +457,7 @@ def get_excel_email_stats(excel_file: str) -> Dict:
         Dict: Statistics about the emails
     """
     try:
-        parser = EmailParser(excel_file)
+        parser = get_email_parser(excel_file)
         return parser.get_summary_stats()
     except EmailParserError as e:
         print(f"Error getting email stats: {e}")
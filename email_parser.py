@@ -6,11 +6,24 @@ It supports grouping emails by ID, retrieving first emails, and paginated readin
 """
 
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+import importlib.util
 import logging
+import re
 from pathlib import Path
 
 
+logger = logging.getLogger(__name__)
+
+# Rust-based xlsx reader used by pandas>=2.2 when python-calamine is installed
+CALAMINE_AVAILABLE = importlib.util.find_spec('python_calamine') is not None
+
+# Parquet sidecar cache of the workbook, used when a parquet engine is installed
+PARQUET_AVAILABLE = any(
+    importlib.util.find_spec(engine) is not None for engine in ('pyarrow', 'fastparquet')
+)
+
+
 class EmailParserError(Exception):
     """Custom exception for EmailParser errors."""
     pass
@@ -27,6 +40,12 @@ class EmailParser:
     - Support paginated reading of emails
     """
     
+    # Parsers are cached and long-lived; fixed attributes avoid a per-instance __dict__
+    __slots__ = (
+        'file_path', 'df', 'expected_columns',
+        '_records_by_id', '_records', '_search_texts', '_summary_stats'
+    )
+    
     def __init__(self, file_path: str):
         """
         Initialize the EmailParser with an Excel file.
@@ -39,11 +58,15 @@ class EmailParser:
         """
         self.file_path = Path(file_path)
         self.df: Optional[pd.DataFrame] = None
-        self.grouped_emails: Optional[Dict[str, pd.DataFrame]] = None
-        
-        # Set up logging
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
+        # Email dictionaries per email ID, in original row order; the parser is shared
+        # process-wide, so public getters hand out copies and these are never mutated
+        self._records_by_id: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        # The same dictionaries in row order, for scans over every email
+        self._records: List[Dict[str, Any]] = []
+        # Per-row text of each searched column, built on first search of that column
+        self._search_texts: Dict[str, List[str]] = {}
+        # Summary statistics, computed on first request (data is read-only after load)
+        self._summary_stats: Optional[Dict[str, Any]] = None
         
         # Expected columns in the Excel file
         self.expected_columns = [
@@ -65,8 +88,8 @@ class EmailParser:
             if not self.file_path.exists():
                 raise EmailParserError(f"File not found: {self.file_path}")
             
-            self.logger.info(f"Loading data from {self.file_path}")
-            self.df = pd.read_excel(self.file_path)
+            logger.info("Loading data from %s", self.file_path)
+            self.df = self._read_cached_workbook()
             
             # Validate columns
             missing_columns = set(self.expected_columns) - set(self.df.columns)
@@ -74,12 +97,20 @@ class EmailParser:
                 raise EmailParserError(f"Missing required columns: {missing_columns}")
             
             # Clean data
-            self.df = self.df.dropna(subset=['email-id'])  # Remove rows without email-id
+            # Remove rows without email-id; the common all-present case keeps the frame as is
+            has_email_id = self.df['email-id'].notna().to_numpy()
+            if not has_email_id.all():
+                self.df = self.df.iloc[has_email_id].reset_index(drop=True)
+            # Integer-coded IDs: each distinct ID is hashed and stringified once
+            self.df['email-id'] = self.df['email-id'].astype('category')
+            # Low-cardinality text columns share one object per distinct value
+            for column in ('sender', 'receiver', 'cs-id'):
+                self.df[column] = self.df[column].astype('category')
             
             # Group emails by email-id
             self._group_emails()
             
-            self.logger.info(f"Successfully loaded {len(self.df)} emails with {len(self.grouped_emails)} unique email IDs")
+            logger.info("Successfully loaded %d emails with %d unique email IDs", len(self.df), len(self._records_by_id))
             
         except pd.errors.EmptyDataError:
             raise EmailParserError("The Excel file is empty")
@@ -88,15 +119,72 @@ class EmailParser:
         except Exception as e:
             raise EmailParserError(f"Unexpected error loading data: {str(e)}")
     
+    def _read_cached_workbook(self) -> pd.DataFrame:
+        """
+        Read the email rows from a Parquet sidecar cache, or from Excel and refresh the cache.
+        
+        The cache (same name, .parquet suffix) is only used when it is at least as new
+        as the Excel file. Any cache read/write failure falls back to the workbook.
+        
+        Returns:
+            pd.DataFrame: Raw email rows
+        """
+        if not PARQUET_AVAILABLE:
+            return self._read_workbook()
+        
+        cache_path = self.file_path.with_suffix('.parquet')
+        try:
+            if cache_path.exists() and cache_path.stat().st_mtime >= self.file_path.stat().st_mtime:
+                df = pd.read_parquet(cache_path)
+                # Parquet hands back None for empty text cells; restore NaN like read_excel
+                for column in df.select_dtypes(include='object').columns:
+                    df[column] = df[column].where(df[column].notna(), float('nan'))
+                return df
+        except Exception as e:
+            logger.warning("Ignoring unreadable cache %s: %s", cache_path, e)
+        
+        df = self._read_workbook()
+        try:
+            df.to_parquet(cache_path, index=False)
+        except Exception as e:
+            logger.warning("Could not write cache %s: %s", cache_path, e)
+        return df
+    
+    def _read_workbook(self) -> pd.DataFrame:
+        """
+        Read the Excel file, preferring the calamine engine when available.
+        
+        Only the expected columns are kept. A callable is used for usecols so
+        that missing columns are still reported by the validation in _load_data.
+        
+        Returns:
+            pd.DataFrame: Raw email rows
+        """
+        expected = frozenset(self.expected_columns)
+        usecols = lambda column: column in expected
+        
+        if CALAMINE_AVAILABLE:
+            try:
+                return pd.read_excel(self.file_path, engine='calamine', usecols=usecols)
+            except ValueError:
+                # pandas < 2.2 does not know the calamine engine
+                logger.info("Calamine engine unavailable, falling back to openpyxl")
+        return pd.read_excel(self.file_path, engine='openpyxl', usecols=usecols)
+    
     def _group_emails(self) -> None:
         """Group emails by email-id for efficient retrieval."""
         if self.df is None:
             raise EmailParserError("No data loaded")
         
-        self.grouped_emails = {}
-        for email_id, group in self.df.groupby('email-id'):
-            # Sort by index to maintain order (assuming original order is meaningful)
-            self.grouped_emails[str(email_id)] = group.sort_index()
+        # Materialize the row dictionaries once and bucket them in a single pass;
+        # rows stay in file order within each ID, so no per-group sort is needed
+        email_ids = self.df['email-id'].cat
+        id_strings = [str(email_id) for email_id in email_ids.categories]
+        
+        self._records = self.df.to_dict(orient='records')
+        self._records_by_id = {}
+        for code, record in zip(email_ids.codes.tolist(), self._records):
+            self._records_by_id.setdefault(id_strings[code], []).append(record)
     
     def get_email_ids(self) -> List[str]:
         """
@@ -105,10 +193,10 @@ class EmailParser:
         Returns:
             List[str]: List of all unique email IDs
         """
-        if self.grouped_emails is None:
+        if self._records_by_id is None:
             raise EmailParserError("No data loaded")
         
-        return list(self.grouped_emails.keys())
+        return list(self._records_by_id.keys())
     
     def get_first_email_by_id(self, email_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -120,16 +208,29 @@ class EmailParser:
         Returns:
             Optional[Dict[str, Any]]: Dictionary containing email data, or None if not found
         """
-        if self.grouped_emails is None:
+        if self._records_by_id is None:
             raise EmailParserError("No data loaded")
         
-        email_id_str = str(email_id)
-        if email_id_str not in self.grouped_emails:
-            self.logger.warning(f"Email ID '{email_id}' not found")
+        records = self._records_by_id.get(str(email_id))
+        if records is None:
+            logger.warning("Email ID '%s' not found", email_id)
             return None
         
-        first_email = self.grouped_emails[email_id_str].iloc[0]
-        return first_email.to_dict()
+        return dict(records[0])
+    
+    def get_first_emails(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve the first email for every email ID in a single pass.
+        
+        Returns:
+            List[Dict[str, Any]]: First email dictionary per email ID, in file order.
+                The dictionaries are shared with the parser and must not be modified.
+        """
+        if self._records_by_id is None:
+            raise EmailParserError("No data loaded")
+        
+        # IDs are bucketed in first-appearance order, so this matches file order
+        return [records[0] for records in self._records_by_id.values()]
     
     def get_emails_by_id(self, email_id: str, page: int = 1, page_size: int = 10) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
@@ -148,7 +249,7 @@ class EmailParser:
         Raises:
             EmailParserError: If page number is invalid
         """
-        if self.grouped_emails is None:
+        if self._records_by_id is None:
             raise EmailParserError("No data loaded")
         
         if page < 1:
@@ -157,9 +258,9 @@ class EmailParser:
         if page_size < 1:
             raise EmailParserError("Page size must be >= 1")
         
-        email_id_str = str(email_id)
-        if email_id_str not in self.grouped_emails:
-            self.logger.warning(f"Email ID '{email_id}' not found")
+        records = self._records_by_id.get(str(email_id))
+        if records is None:
+            logger.warning("Email ID '%s' not found", email_id)
             return [], {
                 'total_emails': 0,
                 'total_pages': 0,
@@ -168,8 +269,7 @@ class EmailParser:
                 'has_previous': False
             }
         
-        emails_df = self.grouped_emails[email_id_str]
-        total_emails = len(emails_df)
+        total_emails = len(records)
         total_pages = (total_emails + page_size - 1) // page_size  # Ceiling division
         
         if page > total_pages and total_pages > 0:
@@ -180,8 +280,7 @@ class EmailParser:
         end_idx = start_idx + page_size
         
         # Get the page data
-        page_emails = emails_df.iloc[start_idx:end_idx]
-        emails_list = [email.to_dict() for _, email in page_emails.iterrows()]
+        emails_list = [dict(record) for record in records[start_idx:end_idx]]
         
         # Pagination metadata
         pagination_info = {
@@ -195,26 +294,38 @@ class EmailParser:
         
         return emails_list, pagination_info
     
-    def get_all_emails_by_id(self, email_id: str) -> List[Dict[str, Any]]:
+    def iter_emails_by_id(self, email_id: str) -> Iterator[Dict[str, Any]]:
         """
-        Retrieve all emails for a given email ID.
+        Iterate over all emails for a given email ID without copying the list.
         
         Args:
             email_id (str): The email ID to search for
             
         Returns:
-            List[Dict[str, Any]]: List of all email dictionaries for the given ID
+            Iterator[Dict[str, Any]]: Email dictionaries for the given ID, in file order.
+                The dictionaries are shared with the parser and must not be modified.
         """
-        if self.grouped_emails is None:
+        if self._records_by_id is None:
             raise EmailParserError("No data loaded")
         
-        email_id_str = str(email_id)
-        if email_id_str not in self.grouped_emails:
-            self.logger.warning(f"Email ID '{email_id}' not found")
-            return []
+        records = self._records_by_id.get(str(email_id))
+        if records is None:
+            logger.warning("Email ID '%s' not found", email_id)
+            return iter(())
         
-        emails_df = self.grouped_emails[email_id_str]
-        return [email.to_dict() for _, email in emails_df.iterrows()]
+        return iter(records)
+    
+    def get_all_emails_by_id(self, email_id: str) -> List[Dict[str, Any]]:
+        """
+        Retrieve all emails for a given email ID.
+        
+        Args:
+            email_id (str): The email ID to search for
+            
+        Returns:
+            List[Dict[str, Any]]: List of all email dictionaries for the given ID
+        """
+        return [dict(record) for record in self.iter_emails_by_id(email_id)]
     
     def get_email_count_by_id(self, email_id: str) -> int:
         """
@@ -226,14 +337,10 @@ class EmailParser:
         Returns:
             int: Number of emails for the given ID
         """
-        if self.grouped_emails is None:
+        if self._records_by_id is None:
             raise EmailParserError("No data loaded")
         
-        email_id_str = str(email_id)
-        if email_id_str not in self.grouped_emails:
-            return 0
-        
-        return len(self.grouped_emails[email_id_str])
+        return len(self._records_by_id.get(str(email_id), ()))
     
     def get_summary_stats(self) -> Dict[str, Any]:
         """
@@ -242,20 +349,24 @@ class EmailParser:
         Returns:
             Dict[str, Any]: Dictionary containing summary statistics
         """
-        if self.df is None or self.grouped_emails is None:
+        if self.df is None or self._records_by_id is None:
             raise EmailParserError("No data loaded")
         
-        email_counts = [len(group) for group in self.grouped_emails.values()]
+        if self._summary_stats is not None:
+            return dict(self._summary_stats)
         
-        return {
+        email_counts = [len(records) for records in self._records_by_id.values()]
+        
+        self._summary_stats = {
             'total_emails': len(self.df),
-            'unique_email_ids': len(self.grouped_emails),
+            'unique_email_ids': len(self._records_by_id),
             'unique_senders': self.df['sender'].nunique(),
             'unique_receivers': self.df['receiver'].nunique(),
             'avg_emails_per_id': sum(email_counts) / len(email_counts) if email_counts else 0,
             'max_emails_per_id': max(email_counts) if email_counts else 0,
             'min_emails_per_id': min(email_counts) if email_counts else 0
         }
+        return dict(self._summary_stats)
     
     def search_emails(self, search_term: str, search_in: List[str] = None) -> List[Dict[str, Any]]:
         """
@@ -279,15 +390,22 @@ class EmailParser:
         if invalid_columns:
             raise EmailParserError(f"Invalid search columns: {invalid_columns}")
         
-        # Create a mask for rows containing the search term
-        mask = pd.Series([False] * len(self.df))
-        
+        # Cache each column's text per row once, then test every row's columns with the
+        # (case-insensitive) pattern in a single pass instead of one pass per column
+        column_texts = []
         for column in search_in:
-            # Convert to string and search (case-insensitive)
-            column_mask = self.df[column].astype(str).str.contains(
-                search_term, case=False, na=False
-            )
-            mask = mask | column_mask
-        
-        matching_emails = self.df[mask]
-        return [email.to_dict() for _, email in matching_emails.iterrows()]
+            texts = self._search_texts.get(column)
+            if texts is None:
+                # Missing cells never match (pandas 3 keeps them as NaN after astype(str))
+                texts = self._search_texts[column] = [
+                    text if isinstance(text, str) else ''
+                    for text in self.df[column].astype(str).tolist()
+                ]
+            column_texts.append(texts)
+        
+        # Matching rows are served from the prebuilt records, not rebuilt from the frame
+        pattern = re.compile(search_term, re.IGNORECASE)
+        return [
+            dict(record) for record, row_texts in zip(self._records, zip(*column_texts))
+            if any(pattern.search(text) for text in row_texts)
+        ]
@@ -8,6 +8,55 @@ from datetime import datetime
 import re
 
 
+# Precompiled patterns for parsing and validating AI responses.
+# Each value is captured in a lookahead so only the label is consumed and a
+# later label on the same line (e.g. "Intent: X (Confidence: High)") still matches.
+# The intent label is anchored to its line start, so each line yields at most one intent.
+INTENT_FIELD_PATTERN = re.compile(
+    r'^[^\n]*?(?:Primary |Secondary )?Intent:[^\S\n]*(?=(?P<intent>[^\n]+))'
+    r'|Confidence:[^\S\n]*(?=(?P<confidence>[^\n]+))'
+    r'|Sub-category:[^\S\n]*(?=(?P<sub_category>[^\n]+))',
+    re.IGNORECASE | re.MULTILINE
+)
+REQUIRED_SECTION_PATTERNS = {
+    "Intent Classification": re.compile(r"##\s*Intent Classification", re.IGNORECASE),
+    "Logistics/Order Status": re.compile(r"##\s*Logistics/Order Status", re.IGNORECASE),
+    "Professional Email Reply": re.compile(r"##\s*Professional Email Reply", re.IGNORECASE)
+}
+
+# Static header and sign-off around every professional email reply
+EMAIL_HEADER_TEMPLATE = (
+    "## Professional Email Reply\n\n"
+    "Dear {customer_name},\n\n"
+    "Thank you for contacting LCSC Electronics. {order_clause}"
+    "we have processed your request and are pleased to provide the following information:\n\n"
+)
+EMAIL_CLOSING = (
+    "If you have any further questions or need additional assistance, please don't hesitate to contact us. "
+    "We appreciate your business and look forward to serving you.\n\n"
+    "Best regards,\n"
+    "LCSC Electronics Customer Service Team\n"
+    "Email: service@lcsc.com\n"
+    "Website: https://lcsc.com\n"
+)
+
+# Keywords per intent for the basic classifier
+INTENT_KEYWORDS = {
+    "Logistics Status Inquiry": ["tracking", "shipping", "delivery", "logistics", "courier", "logistics status", "express delivery", "track order"],
+    "Pre-shipment Order Interception": ["change address", "modify order", "cancel", "change shipping address", "cancel order", "modify order details", "merge orders"],
+    "Batch/DC Code Inquiry": ["date code", "batch code", "lot code", "DC", "batch number", "production date"],
+    "Document Processing": ["invoice", "COC", "package list", "commercial invoice", "invoice document", "packing list"],
+    "Shipped Invoice Processing": ["commercial invoice", "shipped", "shipping invoice", "customs clearance", "customs", "customs documents"],
+    "Others Inquiry": ["price", "technical", "account", "return", "partnership", "complaint"]
+}
+
+# Lowercased once so classification only does substring checks per call
+INTENT_KEYWORDS_LOWER = {
+    intent_name: tuple(keyword.lower() for keyword in keywords)
+    for intent_name, keywords in INTENT_KEYWORDS.items()
+}
+
+
 def format_intent_classification(intents: List[Dict[str, Any]]) -> str:
     """
     Format intent classification results
@@ -21,7 +70,7 @@ def format_intent_classification(intents: List[Dict[str, Any]]) -> str:
     if not intents:
         return "## Intent Classification\n- No intents identified\n"
     
-    formatted = "## Intent Classification\n"
+    parts = ["## Intent Classification\n"]
     
     for i, intent in enumerate(intents):
         intent_name = intent.get('name', 'Unknown')
@@ -29,16 +78,17 @@ def format_intent_classification(intents: List[Dict[str, Any]]) -> str:
         sub_category = intent.get('sub_category', '')
         
         if i == 0:
-            formatted += f"- Primary Intent: {intent_name}\n"
+            parts.append(f"- Primary Intent: {intent_name}\n")
         else:
-            formatted += f"- Secondary Intent: {intent_name}\n"
+            parts.append(f"- Secondary Intent: {intent_name}\n")
         
-        formatted += f"- Confidence: {confidence}\n"
+        parts.append(f"- Confidence: {confidence}\n")
         
         if sub_category:
-            formatted += f"- Sub-category: {sub_category}\n"
+            parts.append(f"- Sub-category: {sub_category}\n")
     
-    return formatted + "\n"
+    parts.append("\n")
+    return "".join(parts)
 
 
 def format_logistics_status(order_data: Optional[Dict[str, Any]], logistics_data: Optional[Dict[str, Any]] = None) -> str:
@@ -55,36 +105,38 @@ def format_logistics_status(order_data: Optional[Dict[str, Any]], logistics_data
     if not order_data:
         return "## Logistics/Order Status\n- No order information available\n\n"
     
-    formatted = "## Logistics/Order Status\n"
-    
     # Basic order information
-    formatted += f"- Order ID: {order_data.get('order_id', 'N/A')}\n"
-    formatted += f"- Current Status: {order_data.get('status', 'Unknown')}\n"
-    formatted += f"- Shipping Status: {order_data.get('shipping_status', 'Unknown')}\n"
+    parts = [
+        "## Logistics/Order Status\n",
+        f"- Order ID: {order_data.get('order_id', 'N/A')}\n",
+        f"- Current Status: {order_data.get('status', 'Unknown')}\n",
+        f"- Shipping Status: {order_data.get('shipping_status', 'Unknown')}\n"
+    ]
     
     # Tracking information
     tracking_number = order_data.get('tracking_number', '')
     if tracking_number:
-        formatted += f"- Tracking Number: {tracking_number}\n"
+        parts.append(f"- Tracking Number: {tracking_number}\n")
     
     # Delivery information
     if logistics_data:
         estimated_delivery = logistics_data.get('estimated_delivery', '')
         if estimated_delivery:
-            formatted += f"- Estimated Delivery: {estimated_delivery}\n"
+            parts.append(f"- Estimated Delivery: {estimated_delivery}\n")
     
     # Actions taken (interceptions, modifications)
     if order_data.get('shipping_status') == 'Intercepted':
-        formatted += f"- Actions Taken: Order intercepted - {order_data.get('intercept_reason', 'Reason not specified')}\n"
-        formatted += f"- Interception Time: {order_data.get('intercept_time', 'Not specified')}\n"
+        parts.append(f"- Actions Taken: Order intercepted - {order_data.get('intercept_reason', 'Reason not specified')}\n")
+        parts.append(f"- Interception Time: {order_data.get('intercept_time', 'Not specified')}\n")
     
     # Order value
     total_amount = order_data.get('total_amount', 0)
     currency = order_data.get('currency', 'USD')
     if total_amount:
-        formatted += f"- Order Value: {total_amount} {currency}\n"
+        parts.append(f"- Order Value: {total_amount} {currency}\n")
     
-    return formatted + "\n"
+    parts.append("\n")
+    return "".join(parts)
 
 
 def format_email_response(response_content: str, customer_name: str = "Valued Customer", 
@@ -101,42 +153,29 @@ def format_email_response(response_content: str, customer_name: str = "Valued Cu
     Returns:
         str: Formatted professional email response
     """
-    formatted = "## Professional Email Reply\n\n"
-    
-    # Email header
-    formatted += f"Dear {customer_name},\n\n"
-    
-    # Thank you opening
-    formatted += "Thank you for contacting LCSC Electronics. "
-    
-    if order_id:
-        formatted += f"Regarding your inquiry about order {order_id}, "
-    
-    formatted += "we have processed your request and are pleased to provide the following information:\n\n"
-    
-    # Main content
-    formatted += response_content + "\n\n"
+    # Email header, thank you opening and main content
+    order_clause = f"Regarding your inquiry about order {order_id}, " if order_id else ""
+    parts = [
+        EMAIL_HEADER_TEMPLATE.format(customer_name=customer_name, order_clause=order_clause),
+        response_content,
+        "\n\n"
+    ]
     
     # Additional information if provided
     if additional_info:
         if additional_info.get('next_steps'):
-            formatted += f"**Next Steps:**\n{additional_info['next_steps']}\n\n"
+            parts.append(f"**Next Steps:**\n{additional_info['next_steps']}\n\n")
         
         if additional_info.get('timeline'):
-            formatted += f"**Timeline:**\n{additional_info['timeline']}\n\n"
+            parts.append(f"**Timeline:**\n{additional_info['timeline']}\n\n")
         
         if additional_info.get('contact_info'):
-            formatted += f"**Contact Information:**\n{additional_info['contact_info']}\n\n"
+            parts.append(f"**Contact Information:**\n{additional_info['contact_info']}\n\n")
     
     # Professional closing
-    formatted += "If you have any further questions or need additional assistance, please don't hesitate to contact us. "
-    formatted += "We appreciate your business and look forward to serving you.\n\n"
-    formatted += "Best regards,\n"
-    formatted += "LCSC Electronics Customer Service Team\n"
-    formatted += "Email: service@lcsc.com\n"
-    formatted += "Website: https://lcsc.com\n"
-    
-    return formatted
+    parts.append(EMAIL_CLOSING)
+    
+    return "".join(parts)
 
 
 def create_structured_response(intents: List[Dict[str, Any]], 
@@ -159,21 +198,19 @@ def create_structured_response(intents: List[Dict[str, Any]],
     Returns:
         str: Complete structured response
     """
-    response = ""
-    
     # Intent Classification section
-    response += format_intent_classification(intents)
+    sections = [format_intent_classification(intents)]
     
     # Logistics/Order Status section (if applicable)
     if order_data or any(intent.get('name', '').lower() in ['logistics status inquiry', 'pre-shipment order interception'] 
                         for intent in intents):
-        response += format_logistics_status(order_data, logistics_data)
+        sections.append(format_logistics_status(order_data, logistics_data))
     
     # Professional Email Reply section
     order_id = order_data.get('order_id') if order_data else None
-    response += format_email_response(email_content, customer_name, order_id, additional_info)
+    sections.append(format_email_response(email_content, customer_name, order_id, additional_info))
     
-    return response
+    return "".join(sections)
 
 
 def extract_intent_from_response(ai_response: str) -> List[Dict[str, Any]]:
@@ -187,39 +224,19 @@ def extract_intent_from_response(ai_response: str) -> List[Dict[str, Any]]:
         List[Dict]: Extracted intent information
     """
     intents = []
-    
-    # Look for intent classification patterns
-    intent_patterns = [
-        r'Primary Intent:\s*([^\n]+)',
-        r'Secondary Intent:\s*([^\n]+)',
-        r'Intent:\s*([^\n]+)'
-    ]
-    
-    confidence_pattern = r'Confidence:\s*([^\n]+)'
-    subcategory_pattern = r'Sub-category:\s*([^\n]+)'
-    
-    lines = ai_response.split('\n')
     current_intent = {}
     
-    for line in lines:
-        # Check for intent patterns
-        for pattern in intent_patterns:
-            match = re.search(pattern, line, re.IGNORECASE)
-            if match:
-                if current_intent:  # Save previous intent
-                    intents.append(current_intent)
-                current_intent = {'name': match.group(1).strip()}
-                break
-        
-        # Check for confidence
-        conf_match = re.search(confidence_pattern, line, re.IGNORECASE)
-        if conf_match and current_intent:
-            current_intent['confidence'] = conf_match.group(1).strip()
+    # Walk every intent/confidence/sub-category field in one scan of the text
+    for match in INTENT_FIELD_PATTERN.finditer(ai_response):
+        field = match.lastgroup
+        value = match.group(field).strip()
         
-        # Check for sub-category
-        sub_match = re.search(subcategory_pattern, line, re.IGNORECASE)
-        if sub_match and current_intent:
-            current_intent['sub_category'] = sub_match.group(1).strip()
+        if field == 'intent':
+            if current_intent:  # Save previous intent
+                intents.append(current_intent)
+            current_intent = {'name': value}
+        elif current_intent:
+            current_intent[field] = value
     
     # Add the last intent
     if current_intent:
@@ -238,16 +255,10 @@ def validate_response_structure(response: str) -> Dict[str, bool]:
     Returns:
         Dict: Validation results for each section
     """
-    required_sections = {
-        "Intent Classification": r"##\s*Intent Classification",
-        "Logistics/Order Status": r"##\s*Logistics/Order Status",
-        "Professional Email Reply": r"##\s*Professional Email Reply"
-    }
-    
     validation_results = {}
     
-    for section_name, pattern in required_sections.items():
-        validation_results[section_name] = bool(re.search(pattern, response, re.IGNORECASE))
+    for section_name, pattern in REQUIRED_SECTION_PATTERNS.items():
+        validation_results[section_name] = bool(pattern.search(response))
     
     return validation_results
 
@@ -268,17 +279,17 @@ def enhance_response_with_metadata(response: str, processing_time: float = None,
     if not (processing_time or tools_used):
         return response
     
-    metadata = "\n## Internal Notes\n"
+    parts = [response, "\n## Internal Notes\n"]
     
     if tools_used:
-        metadata += f"- Tools Used: {', '.join(tools_used)}\n"
+        parts.append(f"- Tools Used: {', '.join(tools_used)}\n")
     
     if processing_time:
-        metadata += f"- Processing Time: {processing_time:.2f} seconds\n"
+        parts.append(f"- Processing Time: {processing_time:.2f} seconds\n")
     
-    metadata += f"- Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+    parts.append(f"- Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
-    return response + metadata
+    return "".join(parts)
 
 
 # Intent classification helper functions
@@ -292,20 +303,11 @@ def classify_intent_by_keywords(email_content: str) -> List[Dict[str, Any]]:
     Returns:
         List[Dict]: Classified intents with confidence scores
     """
-    intent_keywords = {
-        "Logistics Status Inquiry": ["tracking", "shipping", "delivery", "logistics", "courier", "logistics status", "express delivery", "track order"],
-        "Pre-shipment Order Interception": ["change address", "modify order", "cancel", "change shipping address", "cancel order", "modify order details", "merge orders"],
-        "Batch/DC Code Inquiry": ["date code", "batch code", "lot code", "DC", "batch number", "production date"],
-        "Document Processing": ["invoice", "COC", "package list", "commercial invoice", "invoice document", "packing list"],
-        "Shipped Invoice Processing": ["commercial invoice", "shipped", "shipping invoice", "customs clearance", "customs", "customs documents"],
-        "Others Inquiry": ["price", "technical", "account", "return", "partnership", "complaint"]
-    }
-    
     email_lower = email_content.lower()
     classified_intents = []
     
-    for intent_name, keywords in intent_keywords.items():
-        matches = sum(1 for keyword in keywords if keyword.lower() in email_lower)
+    for intent_name, keywords in INTENT_KEYWORDS_LOWER.items():
+        matches = sum(1 for keyword in keywords if keyword in email_lower)
         
         if matches > 0:
             confidence = "High" if matches >= 3 else "Medium" if matches >= 2 else "Low"
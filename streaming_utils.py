@@ -3,10 +3,144 @@ Streaming Utilities for LCSC Email Customer Service System
 Helper functions for processing and formatting streaming events from Strands Agent
 """
 
+import io
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional
 from datetime import datetime
 
+# Tool inputs arrive as JSON strings; use orjson when it is installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+# Last formatted wall-clock second, shared by all event formatting: [epoch_second, "HH:MM:SS"]
+_TIMESTAMP_CACHE = [-1, ""]
+
+
+def _timestamp() -> str:
+    """Return the current time as HH:MM:SS, formatting at most once per second"""
+    now = int(time.time())
+    if now != _TIMESTAMP_CACHE[0]:
+        _TIMESTAMP_CACHE[0] = now
+        _TIMESTAMP_CACHE[1] = time.strftime("%H:%M:%S", time.localtime(now))
+    return _TIMESTAMP_CACHE[1]
+
+
+# Markdown metacharacters escaped in tool parameter values so they render literally
+MARKDOWN_ESCAPE_TABLE = str.maketrans({"`": "\\`", "*": "\\*", "_": "\\_"})
+
+# Final response shown when the agent finished without producing any text
+NO_RESPONSE_MESSAGE = "No response generated. Please check the thinking process for details."
+
+# Display templates for formatted events (%-style: timestamp first, then details)
+ERROR_TEMPLATE = "🔴 **[%s] ERROR:** %s\n\n"
+TOOL_CALL_TEMPLATE = "\n🔧 **[%s] TOOL CALL:** %s%s\n**Tool ID:** %s...\n\n"
+THINKING_TEMPLATE = "🧠 **[%s] THINKING:** %s\n\n"
+INIT_EVENT_LOOP_TEMPLATE = "⚡ **[%s] INITIALIZING:** Starting AI processing...\n\n"
+START_EVENT_LOOP_TEMPLATE = "🚀 **[%s] STARTED:** AI agent is now processing your request...\n\n"
+START_TEMPLATE = "🔄 **[%s] NEW CYCLE:** Beginning analysis cycle...\n\n"
+MESSAGE_TEMPLATE = "\n\n💬 **[%s] MESSAGE:** New message created\n\n"
+FORCE_STOP_TEMPLATE = "⏹️ **[%s] STOPPED:** Processing stopped - %s\n\n"
+
+
+# Event formatters: each takes (event, collector) and returns the display text,
+# or None when the event does not qualify so later event types are tried
+def _format_error(event: Dict[str, Any], collector) -> Optional[str]:
+    return ERROR_TEMPLATE % (_timestamp(), event['error'])
+
+
+def _format_tool_use(event: Dict[str, Any], collector) -> Optional[str]:
+    # Tool usage events - improved formatting
+    tool_info = event["current_tool_use"]
+    tool_name = tool_info.get("name", "Unknown Tool")
+    tool_input = tool_info.get("input", {})
+    tool_use_id = tool_info.get("toolUseId", "")
+    
+    # Parse input if it's a string
+    if isinstance(tool_input, str):
+        try:
+            tool_input = json_loads(tool_input)
+        except ValueError:
+            pass
+    
+    formatted_input = ""
+    if tool_input:
+        if isinstance(tool_input, dict):
+            formatted_input = "\n**Parameters:** " + ", ".join(
+                [f"{key}='{str(value).translate(MARKDOWN_ESCAPE_TABLE)}'" for key, value in tool_input.items()]
+            )
+        else:
+            formatted_input = f"\n**Input:** `{tool_input}`"
+    
+    return TOOL_CALL_TEMPLATE % (_timestamp(), tool_name, formatted_input, tool_use_id[:8])
+
+
+def _format_reasoning(event: Dict[str, Any], collector) -> Optional[str]:
+    if not event["reasoning"] or "reasoningText" not in event:
+        return None
+    
+    reasoning_text = event["reasoningText"]
+    timestamp = _timestamp()
+    
+    if collector:
+        # Use buffering for smoother display
+        buffered_text = collector.add_thinking_text(reasoning_text)
+        if buffered_text:
+            return THINKING_TEMPLATE % (timestamp, buffered_text)
+        else:
+            return ""  # Text is being buffered
+    else:
+        # Fallback to immediate display - but only if it's substantial
+        if len(reasoning_text.strip()) >= 10:  # Higher threshold for better quality
+            return THINKING_TEMPLATE % (timestamp, reasoning_text.strip())
+        else:
+            return ""
+
+
+def _format_init_event_loop(event: Dict[str, Any], collector) -> Optional[str]:
+    if not event["init_event_loop"]:
+        return None
+    return INIT_EVENT_LOOP_TEMPLATE % _timestamp()
+
+
+def _format_start_event_loop(event: Dict[str, Any], collector) -> Optional[str]:
+    if not event["start_event_loop"]:
+        return None
+    return START_EVENT_LOOP_TEMPLATE % _timestamp()
+
+
+def _format_start(event: Dict[str, Any], collector) -> Optional[str]:
+    if not event["start"]:
+        return None
+    return START_TEMPLATE % _timestamp()
+
+
+def _format_message(event: Dict[str, Any], collector) -> Optional[str]:
+    return MESSAGE_TEMPLATE % _timestamp()
+
+
+def _format_force_stop(event: Dict[str, Any], collector) -> Optional[str]:
+    if not event["force_stop"]:
+        return None
+    reason = event.get("force_stop_reason", "Unknown reason")
+    return FORCE_STOP_TEMPLATE % (_timestamp(), reason)
+
+
+# Event keys in priority order with their formatters; the first key present wins.
+# Text "data" events (second after "error") are answered before this table is walked.
+EVENT_FORMATTERS = (
+    ("error", _format_error),
+    ("current_tool_use", _format_tool_use),
+    ("reasoning", _format_reasoning),
+    ("init_event_loop", _format_init_event_loop),
+    ("start_event_loop", _format_start_event_loop),
+    ("start", _format_start),
+    ("message", _format_message),
+    ("force_stop", _format_force_stop)
+)
+
 
 def format_streaming_event(event: Dict[str, Any], collector=None) -> str:
     """
@@ -19,85 +153,18 @@ def format_streaming_event(event: Dict[str, Any], collector=None) -> str:
     Returns:
         str: Formatted event string for UI display
     """
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    
-    # Handle different event types
-    if "error" in event:
-        return f"🔴 **[{timestamp}] ERROR:** {event['error']}\n\n"
-    
-    # Text generation events - don't display until thinking is complete
-    if "data" in event:
-        if collector:
-            # Only return data if we've seen a MESSAGE event (thinking complete)
-            has_message = any(e.get("message") for e in collector.events)
-            if has_message:
-                return event["data"]
-            else:
-                return ""  # Buffer the response data until thinking is done
-        else:
+    # Text generation events dominate the stream - return them without further work,
+    # but don't display until thinking is complete (a MESSAGE event was seen)
+    if "data" in event and "error" not in event:
+        if collector is None or collector.has_message_event:
             return event["data"]
+        return ""  # Buffer the response data until thinking is done
     
-    # Tool usage events - improved formatting
-    if "current_tool_use" in event:
-        tool_info = event["current_tool_use"]
-        tool_name = tool_info.get("name", "Unknown Tool")
-        tool_input = tool_info.get("input", {})
-        tool_use_id = tool_info.get("toolUseId", "")
-        
-        # Parse input if it's a string
-        if isinstance(tool_input, str):
-            try:
-                import json
-                tool_input = json.loads(tool_input)
-            except:
-                pass
-        
-        formatted_input = ""
-        if tool_input:
-            if isinstance(tool_input, dict):
-                formatted_params = []
-                for key, value in tool_input.items():
-                    formatted_params.append(f"{key}='{value}'")
-                formatted_input = f"\n**Parameters:** {', '.join(formatted_params)}"
-            else:
-                formatted_input = f"\n**Input:** `{tool_input}`"
-        
-        return f"\n🔧 **[{timestamp}] TOOL CALL:** {tool_name}{formatted_input}\n**Tool ID:** {tool_use_id[:8]}...\n\n"
-    
-    # Reasoning events - use buffering if collector is provided
-    if event.get("reasoning") and "reasoningText" in event:
-        reasoning_text = event["reasoningText"]
-        
-        if collector:
-            # Use buffering for smoother display
-            buffered_text = collector.add_thinking_text(reasoning_text)
-            if buffered_text:
-                return f"🧠 **[{timestamp}] THINKING:** {buffered_text}\n\n"
-            else:
-                return ""  # Text is being buffered
-        else:
-            # Fallback to immediate display - but only if it's substantial
-            if len(reasoning_text.strip()) >= 10:  # Higher threshold for better quality
-                return f"🧠 **[{timestamp}] THINKING:** {reasoning_text.strip()}\n\n"
-            else:
-                return ""
-    
-    # Lifecycle events
-    if event.get("init_event_loop"):
-        return f"⚡ **[{timestamp}] INITIALIZING:** Starting AI processing...\n\n"
-    
-    if event.get("start_event_loop"):
-        return f"🚀 **[{timestamp}] STARTED:** AI agent is now processing your request...\n\n"
-    
-    if event.get("start"):
-        return f"🔄 **[{timestamp}] NEW CYCLE:** Beginning analysis cycle...\n\n"
-    
-    if "message" in event:
-        return f"\n\n💬 **[{timestamp}] MESSAGE:** New message created\n\n"
-    
-    if event.get("force_stop"):
-        reason = event.get("force_stop_reason", "Unknown reason")
-        return f"⏹️ **[{timestamp}] STOPPED:** Processing stopped - {reason}\n\n"
+    for key, formatter in EVENT_FORMATTERS:
+        if key in event:
+            formatted = formatter(event, collector)
+            if formatted is not None:
+                return formatted
     
     # Default case for unhandled events
     # if event:
@@ -136,11 +203,36 @@ def extract_final_response(events: List[Dict[str, Any]]) -> str:
     final_response = "".join(response_parts).strip()
     
     if not final_response:
-        return "No response generated. Please check the thinking process for details."
+        return NO_RESPONSE_MESSAGE
     
     return final_response
 
 
+# Event categories used for analysis and session summaries
+EVENT_CATEGORIES = ("reasoning", "tool_usage", "text_generation", "lifecycle", "errors")
+
+
+def classify_event(event: Dict[str, Any]) -> str:
+    """
+    Get the analysis category of a single streaming event
+    
+    Args:
+        event: Streaming event
+        
+    Returns:
+        str: One of EVENT_CATEGORIES
+    """
+    if "error" in event:
+        return "errors"
+    if event.get("reasoning"):
+        return "reasoning"
+    if "current_tool_use" in event:
+        return "tool_usage"
+    if "data" in event:
+        return "text_generation"
+    return "lifecycle"
+
+
 def categorize_events(events: List[Dict[str, Any]]) -> Dict[str, List[Dict]]:
     """
     Categorize streaming events by type for analysis
@@ -151,35 +243,21 @@ def categorize_events(events: List[Dict[str, Any]]) -> Dict[str, List[Dict]]:
     Returns:
         Dict: Categorized events
     """
-    categories = {
-        "reasoning": [],
-        "tool_usage": [],
-        "text_generation": [],
-        "lifecycle": [],
-        "errors": []
-    }
+    categories = {category: [] for category in EVENT_CATEGORIES}
     
     for event in events:
-        if "error" in event:
-            categories["errors"].append(event)
-        elif event.get("reasoning"):
-            categories["reasoning"].append(event)
-        elif "current_tool_use" in event:
-            categories["tool_usage"].append(event)
-        elif "data" in event:
-            categories["text_generation"].append(event)
-        else:
-            categories["lifecycle"].append(event)
+        categories[classify_event(event)].append(event)
     
     return categories
 
 
-def create_event_summary(events: List[Dict[str, Any]]) -> str:
+def create_event_summary(events: List[Dict[str, Any]], event_categories: Optional[Iterable[str]] = None) -> str:
     """
     Create a summary of the streaming session
     
     Args:
         events: List of streaming events
+        event_categories: Category of each event, if already classified; computed otherwise
         
     Returns:
         str: Event summary
@@ -187,29 +265,38 @@ def create_event_summary(events: List[Dict[str, Any]]) -> str:
     if not events:
         return "No events to summarize."
     
-    categories = categorize_events(events)
+    if event_categories is None:
+        event_categories = map(classify_event, events)
+    
+    # Count categories in one pass, keeping only the events the summary prints
+    counts = dict.fromkeys(EVENT_CATEGORIES, 0)
+    errors = []
     
     # Count unique tool calls (avoid counting incremental updates)
     unique_tool_calls = set()
     tool_names_used = set()
     
-    for event in categories["tool_usage"]:
-        tool_info = event.get("current_tool_use", {})
-        tool_name = tool_info.get("name")
-        tool_use_id = tool_info.get("toolUseId")
-        
-        if tool_name and tool_use_id:
-            unique_tool_calls.add(tool_use_id)
-            tool_names_used.add(tool_name)
+    for event, category in zip(events, event_categories):
+        counts[category] += 1
+        if category == "errors":
+            errors.append(event)
+        elif category == "tool_usage":
+            tool_info = event.get("current_tool_use", {})
+            tool_name = tool_info.get("name")
+            tool_use_id = tool_info.get("toolUseId")
+            
+            if tool_name and tool_use_id:
+                unique_tool_calls.add(tool_use_id)
+                tool_names_used.add(tool_name)
     
     summary_parts = [
         "## 📊 Session Summary\n",
         f"**Total Events:** {len(events)}\n",
-        f"**Reasoning Steps:** {len(categories['reasoning'])}\n",
+        f"**Reasoning Steps:** {counts['reasoning']}\n",
         f"**Tools Used:** {len(unique_tool_calls)}\n",
-        f"**Text Chunks:** {len(categories['text_generation'])}\n",
-        f"**Lifecycle Events:** {len(categories['lifecycle'])}\n",
-        f"**Errors:** {len(categories['errors'])}\n\n"
+        f"**Text Chunks:** {counts['text_generation']}\n",
+        f"**Lifecycle Events:** {counts['lifecycle']}\n",
+        f"**Errors:** {len(errors)}\n\n"
     ]
     
     # List tools used
@@ -217,9 +304,9 @@ def create_event_summary(events: List[Dict[str, Any]]) -> str:
         summary_parts.append(f"**Tools Called:** {', '.join(sorted(tool_names_used))}\n\n")
     
     # Show errors if any
-    if categories["errors"]:
+    if errors:
         summary_parts.append("**Errors Encountered:**\n")
-        for i, error_event in enumerate(categories["errors"], 1):
+        for i, error_event in enumerate(errors, 1):
             summary_parts.append(f"{i}. {error_event.get('error', 'Unknown error')}\n")
         summary_parts.append("\n")
     
@@ -231,25 +318,43 @@ class StreamingEventCollector:
     Utility class to collect and manage streaming events
     """
     
+    # Created for every streamed request and every email in a batch run, and
+    # add_event reads these attributes once per event
+    __slots__ = (
+        "events", "event_categories", "start_time", "is_complete",
+        "has_message_event", "response_parts", "thinking_chunks", "thinking_length",
+        "last_thinking_flush", "summary_cache"
+    )
+    
     def __init__(self):
         self.events: List[Dict[str, Any]] = []
-        self.start_time = time.time()
+        # Category of each event (parallel to events), classified once on arrival
+        self.event_categories: List[str] = []
+        # Monotonic clock: collector times are only compared, never displayed
+        self.start_time = time.monotonic()
         self.is_complete = False
-        self.thinking_buffer = ""  # Buffer for thinking text chunks
-        self.last_thinking_flush = time.time()
+        self.has_message_event = False  # Set once a MESSAGE event arrives (thinking complete)
+        self.response_parts: List[str] = []  # Response text (non-reasoning data) in arrival order
+        self.summary_cache: Optional[tuple] = None  # (event count, summary) of the last summary
+        # Buffered thinking text chunks and their total length, joined only on flush
+        self.thinking_chunks: List[str] = []
+        self.thinking_length = 0
+        self.last_thinking_flush = self.start_time
     
     def add_event(self, event: Dict[str, Any]):
         """Add an event to the collection"""
-        self.events.append({
-            **event,
-            "_timestamp": time.time(),
-            "_relative_time": time.time() - self.start_time
-        })
+        if event.get("message"):
+            self.has_message_event = True
+        if "data" in event and not event.get("reasoning"):
+            self.response_parts.append(event["data"])
+        self.events.append(event)
+        self.event_categories.append(classify_event(event))
     
-    def should_flush_thinking_buffer(self) -> bool:
+    def should_flush_thinking_buffer(self, current_time: Optional[float] = None) -> bool:
         """Determine if thinking buffer should be flushed - very conservative approach"""
-        current_time = time.time()
-        buffer_length = len(self.thinking_buffer.strip())
+        if current_time is None:
+            current_time = time.monotonic()
+        buffer_length = self.thinking_length
         
         # Extremely conservative flushing - only flush when absolutely necessary:
         
@@ -270,25 +375,31 @@ class StreamingEventCollector:
         if not text or not text.strip():
             return ""
             
-        self.thinking_buffer += text
+        self.thinking_chunks.append(text)
+        self.thinking_length += len(text)
         
-        # Check if we should flush based on current conditions
-        if self.should_flush_thinking_buffer():
-            result = self.thinking_buffer.strip()
-            self.thinking_buffer = ""
-            self.last_thinking_flush = time.time()
-            return result
+        # Check if we should flush based on current conditions (one clock read per chunk)
+        now = time.monotonic()
+        if self.should_flush_thinking_buffer(now):
+            self.last_thinking_flush = now
+            return self._take_thinking_text()
         
         return ""
     
     def force_flush_thinking_buffer(self) -> str:
         """Force flush any remaining thinking buffer"""
-        if self.thinking_buffer.strip():
-            result = self.thinking_buffer.strip()
-            self.thinking_buffer = ""
-            return result
+        # Only non-blank chunks are buffered, so any chunk means there is text to flush
+        if self.thinking_chunks:
+            return self._take_thinking_text()
         return ""
     
+    def _take_thinking_text(self) -> str:
+        """Join and clear the buffered thinking chunks"""
+        result = "".join(self.thinking_chunks).strip()
+        self.thinking_chunks.clear()
+        self.thinking_length = 0
+        return result
+    
     def mark_complete(self):
         """Mark the streaming session as complete"""
         self.is_complete = True
@@ -298,31 +409,42 @@ class StreamingEventCollector:
         if not self.events:
             return "🤔 **Agent Loop**\n\nNo events captured yet..."
         
-        display_parts = [
-            "# 🧠 AI Agent Agent Loop\n",
-            f"**Session Started:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
-            "---\n\n"
-        ]
+        # Write straight into one growing buffer rather than collecting parts to join
+        display = io.StringIO()
+        display.write("# 🧠 AI Agent Agent Loop\n")
+        display.write(f"**Session Started:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        display.write("---\n\n")
         
         for event in self.events:
             formatted_event = format_streaming_event(event)
             if formatted_event.strip():  # Only add non-empty events
-                display_parts.append(formatted_event)
+                display.write(formatted_event)
         
-        display_parts.append("\n---\n**End of Agent Loop**")
+        display.write("\n---\n**End of Agent Loop**")
         
-        return "".join(display_parts)
+        return display.getvalue()
     
     def get_final_response(self) -> str:
-        """Get the final response text"""
-        return extract_final_response(self.events)
+        """Get the final response text, built from the response parts collected so far"""
+        if not self.has_message_event:
+            return ""  # Don't return response until thinking is complete
+        
+        final_response = "".join(self.response_parts).strip()
+        return final_response or NO_RESPONSE_MESSAGE
     
     def get_summary(self) -> str:
-        """Get session summary"""
-        return create_event_summary(self.events)
+        """Get session summary, reusing the last one while no new events have arrived"""
+        event_count = len(self.events)
+        if self.summary_cache is None or self.summary_cache[0] != event_count:
+            self.summary_cache = (event_count, create_event_summary(self.events, self.event_categories))
+        return self.summary_cache[1]
     
     def clear(self):
         """Clear all events and reset"""
         self.events.clear()
-        self.start_time = time.time()
+        self.event_categories.clear()
+        self.start_time = time.monotonic()
         self.is_complete = False
+        self.has_message_event = False
+        self.response_parts.clear()
+        self.summary_cache = None